@@ -0,0 +1,186 @@
+# Columnar Store for App-Sizing-Statistics of All Releases of All OAMs
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+import logging
+import os
+from array import array
+
+from app_sizing_stat import AppSizingStat
+
+
+class AppSizingHistory:
+    """
+    Keeps the AppSizingStat-values of every analysed release in one column per metric.
+
+    Each row is one release of one OAM. Strings (OAM-name, tag, ...) are stored in plain lists, OAM-names are
+    referenced by index only. All numeric values are kept in typed arrays, so even long histories stay compact
+    and queries on a single metric do not need to touch any other data.
+    """
+
+    FORMAT_VERSION = "v0.1.0"
+    METRICS = AppSizingStat.METRICS
+
+    def __init__(self, store_path=os.path.join("releases_data", "app_sizing_history.json")):
+        self.store_path = store_path
+        self.oam_names = []
+        self._oam_index = {}
+        self.col_oam = array('H')
+        self.col_prerelease = array('b')
+        self.col_tag_name = []
+        self.col_published_at = []
+        self.col_asset = []
+        self.col_metrics = {metric: array('q') for metric in self.METRICS}
+        self._known_releases = set()
+        self._rows_by_oam = None
+
+    def __len__(self):
+        return len(self.col_oam)
+
+    def load(self):
+        """
+        Read the store of the last run, if present.
+
+        :return: self
+        """
+        if not os.path.exists(self.store_path):
+            logging.info(f"No App-Sizing-History found in {self.store_path}, start with empty history")
+            return self
+        with open(self.store_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("OpenKnxFormatVersion") != self.FORMAT_VERSION:
+            logging.warning(f"Ignore App-Sizing-History in unsupported format {data.get('OpenKnxFormatVersion')}")
+            return self
+
+        columns = data["columns"]
+        for name in data["oams"]:
+            self._get_oam_index(name)
+        self.col_oam = array('H', columns["oam"])
+        self.col_prerelease = array('b', columns["prerelease"])
+        self.col_tag_name = columns["tag_name"]
+        self.col_published_at = columns["published_at"]
+        self.col_asset = columns["asset"]
+        for metric in self.METRICS:
+            # metrics added later are filled with 0 for old rows
+            self.col_metrics[metric] = array('q', columns.get(metric, [0] * len(self.col_oam)))
+        self._known_releases = {
+            (self.oam_names[oam_idx], tag_name) for oam_idx, tag_name in zip(self.col_oam, self.col_tag_name)
+        }
+        self._rows_by_oam = None
+        logging.info(f"Loaded App-Sizing-History with {len(self)} releases of {len(self.oam_names)} OAMs")
+        return self
+
+    def save(self):
+        data = {
+            "OpenKnxContentType": "OpenKNX/OAM/AppSizingHistory",
+            "OpenKnxFormatVersion": self.FORMAT_VERSION,
+            "oams": self.oam_names,
+            "columns": {
+                "oam": self.col_oam.tolist(),
+                "prerelease": self.col_prerelease.tolist(),
+                "tag_name": self.col_tag_name,
+                "published_at": self.col_published_at,
+                "asset": self.col_asset,
+                **{metric: values.tolist() for metric, values in self.col_metrics.items()},
+            },
+        }
+        os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+        with open(self.store_path, 'w', encoding='utf-8') as f:
+            # one line per column is compact and still diff-able
+            f.write(json.dumps(data, separators=(',', ':')).replace('],"', '],\n"'))
+
+    def _get_oam_index(self, oam):
+        if oam not in self._oam_index:
+            self._oam_index[oam] = len(self.oam_names)
+            self.oam_names.append(oam)
+        return self._oam_index[oam]
+
+    def contains(self, oam, tag_name):
+        return (oam, tag_name) in self._known_releases
+
+    def add(self, oam, release, asset_key, app_stat):
+        """
+        Append the statistics of one release.
+
+        :param oam: name of the OAM
+        :param release: Release as collected by ReleaseManager
+        :param asset_key: identification of the analysed asset (digest or file name)
+        :param app_stat: AppSizingStat or dict as returned by AppSizingStat.to_dict()
+        """
+        stat = app_stat if isinstance(app_stat, dict) else app_stat.to_dict()
+        self.col_oam.append(self._get_oam_index(oam))
+        self.col_prerelease.append(1 if release.prerelease else 0)
+        self.col_tag_name.append(release.tag_name)
+        self.col_published_at.append(release.published_at)
+        self.col_asset.append(asset_key)
+        for metric, values in self.col_metrics.items():
+            values.append(int(stat.get(metric) or 0))
+        self._known_releases.add((oam, release.tag_name))
+        self._rows_by_oam = None
+
+    def column(self, metric):
+        """
+        :return: all values of metric over all rows (array)
+        """
+        return self.col_metrics[metric]
+
+    def rows_of(self, oam):
+        """
+        :return: row-indices of the releases of oam, ordered by publishing time
+        """
+        if self._rows_by_oam is None:
+            rows_by_oam = {}
+            for row, oam_idx in enumerate(self.col_oam):
+                rows_by_oam.setdefault(oam_idx, []).append(row)
+            self._rows_by_oam = {
+                oam_idx: array('I', sorted(rows, key=lambda r: self.col_published_at[r] or ""))
+                for oam_idx, rows in rows_by_oam.items()
+            }
+        oam_idx = self._oam_index.get(oam)
+        return self._rows_by_oam.get(oam_idx, array('I'))
+
+    def series(self, oam, metric):
+        """
+        :return: list of (tag_name, published_at, value) for all releases of oam, oldest first
+        """
+        values = self.col_metrics[metric]
+        return [(self.col_tag_name[r], self.col_published_at[r], values[r]) for r in self.rows_of(oam)]
+
+    def growth_alerts(self, metric="parameter_memory_size", threshold=0.1):
+        """
+        Find OAMs with a relevant growth of metric from the previous to the latest release.
+
+        :param metric: metric to check
+        :param threshold: relative growth to report, e.g. 0.1 for +10%
+        :return: dict oam -> (previous_value, latest_value)
+        """
+        alerts = {}
+        values = self.col_metrics[metric]
+        for oam in self.oam_names:
+            rows = self.rows_of(oam)
+            if len(rows) < 2:
+                continue
+            previous, latest = values[rows[-2]], values[rows[-1]]
+            if previous > 0 and (latest - previous) / previous > threshold:
+                alerts[oam] = (previous, latest)
+        return alerts
+
+    def to_trend_json(self, oam):
+        """
+        :return: JSON-ready trend data of a single OAM
+        """
+        rows = self.rows_of(oam)
+        return {
+            "OpenKnxContentType": "OpenKNX/OAM/AppSizingTrend",
+            "OpenKnxFormatVersion": self.FORMAT_VERSION,
+            "oam": oam,
+            "releases": [
+                {
+                    "tag_name": self.col_tag_name[r],
+                    "published_at": self.col_published_at[r],
+                    "prerelease": bool(self.col_prerelease[r]),
+                    **{metric: values[r] for metric, values in self.col_metrics.items()},
+                }
+                for r in rows
+            ],
+        }
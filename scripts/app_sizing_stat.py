@@ -2,12 +2,33 @@
 # (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
 
 import defusedxml.ElementTree as ET  # secure replacement for  import xml.etree.ElementTree as ET
-from io import BytesIO
 
 
 class AppSizingStat:
     """Class to extract and store application sizing information from ETS app XML files."""
 
+    # numeric values, usable for comparison between releases
+    METRICS = (
+        "parameter_memory_size",
+        "file_size",
+        "line_count",
+        "parameter_count",
+        "parameter_ref_count",
+        "parameter_calculation_count",
+        "com_object_count",
+        "com_object_ref_count",
+        "address_table_max_entries",
+        "association_table_max_entries",
+        "script_size",
+        "script_lines",
+        "module_def_count",
+        "dynamic_element_count",
+        "choose_element_count",
+        "assign_element_count",
+        "parameter_block_count",
+        "max_param_ref_ref_count",
+    )
+
     def __init__(self, xml_file):
         """
         Initialize AppSizingStat with XML file data.
@@ -52,27 +73,17 @@ class AppSizingStat:
 
     def _process_file(self, xml_file):
         """Process the XML file to extract statistics"""
+        if isinstance(xml_file, str):
+            with open(xml_file, 'rb') as f:
+                self._process_stream(f)
+        elif hasattr(xml_file, 'read'):
+            self._process_stream(xml_file)
+
+    def _process_stream(self, xml_file):
+        """Parse the XML directly from stream, size and lines are counted while reading"""
+        reader = _CountingReader(xml_file)
         try:
-            # Read content (works for both file paths and file-like objects)
-            content = self._read_content(xml_file)
-            if not content:
-                return
-
-            # Get content size
-            self.file_size = len(content)
-
-            # Count lines
-            if isinstance(content, bytes):
-                self.line_count = content.count(b'\n') + 1
-            else:
-                self.line_count = content.count('\n') + 1
-
-            # Create BytesIO for parsing
-            if isinstance(content, str):
-                content = content.encode('utf-8')
-
-            xml_data = BytesIO(content)
-            tree = ET.parse(xml_data)
+            tree = ET.parse(reader)
             root = tree.getroot()
 
             # Erfasse die Attribute des Elements ApplicationProgram
@@ -137,24 +148,30 @@ class AppSizingStat:
                         self.max_param_ref_ref_count = max(self.max_param_ref_ref_count, len(param_ref_refs))
 
         except Exception as e:
-            print(f"Error processing XML: {e}")
-
-    def _read_content(self, file_obj):
-        """Read content from file object or path"""
-        try:
-            # If it's a string (file path)
-            if isinstance(file_obj, str):
-                with open(file_obj, 'rb') as f:
-                    return f.read()
-
-            # If it's a file-like object
-            elif hasattr(file_obj, 'read'):
-                return file_obj.read()
+            if reader.size > 0:
+                print(f"Error processing XML: {e}")
+            reader.drain()
+        finally:
+            self.file_size = reader.size
+            self.line_count = reader.newline_count + 1 if reader.size > 0 else 0
+
+    def to_dict(self):
+        """
+        Return the statistics as JSON-serializable dict, e.g. for caching in releases_data.
 
-            return None
-        except Exception as e:
-            print(f"Error reading file: {e}")
-            return None
+        Returns:
+            dict with application identification and all METRICS
+        """
+        data = {
+            "application_number": self.application_number,
+            "application_version": self.application_version,
+            "replaces_version": self.replaces_version,
+            "application_name": self.application_name,
+            "application_id": self.application_id,
+        }
+        for metric in self.METRICS:
+            data[metric] = getattr(self, metric)
+        return data
 
     def __str__(self):
         """
@@ -178,3 +195,26 @@ class AppSizingStat:
                f"DynamicElements={self.dynamic_element_count} (Choose={self.choose_element_count}, Assign={self.assign_element_count}), " \
                f"ParameterBlocks={self.parameter_block_count}, " \
                f"MaxParamRefRefsInBlock={self.max_param_ref_ref_count}]"
+
+
+class _CountingReader:
+    """Pass-through reader counting bytes and lines, so the XML needs no second copy in memory"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.size = 0
+        self.newline_count = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.size += len(data)
+        self.newline_count += data.count(b'\n')
+        return data
+
+    def drain(self, chunk_size=64 * 1024):
+        """Read the rest of the stream, e.g. to complete the counts after a parse error"""
+        try:
+            while self.read(chunk_size):
+                pass
+        except Exception as e:
+            print(f"Error reading file: {e}")
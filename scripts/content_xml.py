@@ -0,0 +1,129 @@
+# Read Product-Info from content.xml of OpenKNX-Release
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import codecs
+import logging
+import re
+from typing import NamedTuple, Optional
+
+import defusedxml.ElementTree as ET  # secure replacement for  import xml.etree.ElementTree as ET
+
+
+class Product(NamedTuple):
+    """Device supported by a release, as listed in content.xml"""
+    name: str
+    order_number: Optional[str]
+    hardware_id: Optional[str]
+
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+_XML_DECLARATION_ENCODING = re.compile(rb'^<\?xml[^>]*?encoding=["\']([A-Za-z0-9._-]+)["\']')
+
+# [[WORK-AROUND]] quick-fix for older releases with broken XML:
+_REPAIRS = (
+    (b'<Products>\r\n</Content>', b'</Products>\r\n</Content>'),
+)
+
+
+def detect_xml_encoding(data):
+    """
+    Detect the encoding of XML data from BOM, from the byte pattern of the first characters, or from the XML declaration.
+
+    :param data: (start of) the XML file as bytes
+    :return: (encoding, length of BOM)
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding, len(bom)
+    # [[WORK-AROUND]] some releases contain utf-16le without BOM, but with declaration of utf-8
+    if data[1:2] == b'\x00' and data[0:1] != b'\x00':
+        return 'utf-16-le', 0
+    if data[0:1] == b'\x00' and data[1:2] != b'\x00':
+        return 'utf-16-be', 0
+    match = _XML_DECLARATION_ENCODING.match(data)
+    return (match.group(1).decode('ascii').lower() if match else 'utf-8'), 0
+
+
+class _RepairingReader:
+    """
+    File-like object delivering a content.xml as UTF-8 with known defects repaired, converted chunk by chunk
+    while the parser reads, so the member is never held in memory completely.
+    """
+
+    HEAD_SIZE = 256
+
+    def __init__(self, source, source_name, chunk_size=64 * 1024):
+        self.source = source
+        self.source_name = source_name
+        self.chunk_size = chunk_size
+        self._decoder = None
+        self._output = bytearray()
+        self._tail = b""  # end of the converted data, held back as it may be the start of a defect
+        self._tail_size = max(len(broken) for broken, _ in _REPAIRS) - 1
+        self._repaired = False
+        self._eof = False
+
+        head = source.read(self.HEAD_SIZE)
+        encoding, bom_length = detect_xml_encoding(head)
+        if encoding.replace('-', '') != 'utf8':
+            logging.warning(f"((>>WORKAROUND<<)) 'content.xml' not UTF-8 encoded, read as {encoding}: {source_name}")
+            self._decoder = codecs.getincrementaldecoder(encoding)()
+            head = self._decoder.decode(head[bom_length:]).encode('utf-8')
+            # the parser has to read the converted data as declared
+            head = re.sub(rb'^(<\?xml[^>]*?encoding=["\'])[A-Za-z0-9._-]+', rb'\1utf-8', head, count=1)
+        self._append(head, not head)
+
+    def _append(self, data, final):
+        data = self._tail + data
+        for broken, fixed in _REPAIRS:
+            repaired = data.replace(broken, fixed)
+            if repaired != data:
+                self._repaired = True
+                data = repaired
+        if final:
+            self._tail = b""
+            self._eof = True
+            if self._repaired:
+                logging.warning(f"((>>WORKAROUND<<)) Quick-Fixed broken XML in 'content.xml' found in {self.source_name}")
+        else:
+            split = max(0, len(data) - self._tail_size)
+            self._tail = data[split:]
+            data = data[:split]
+        self._output += data
+
+    def _read_chunk(self):
+        data = self.source.read(self.chunk_size)
+        final = not data
+        if self._decoder is not None:
+            data = self._decoder.decode(data, final).encode('utf-8')
+        self._append(data, final)
+
+    def read(self, size=-1):
+        while not self._eof and (size is None or size < 0 or len(self._output) < size):
+            self._read_chunk()
+        if size is None or size < 0 or size > len(self._output):
+            size = len(self._output)
+        data = bytes(self._output[:size])
+        del self._output[:size]
+        return data
+
+
+def iter_products(xml_file, source_name="", chunk_size=64 * 1024):
+    """
+    Read the products of a content.xml, element by element without building the full tree.
+    Encoding and known defects are handled on the byte stream, while the parser reads.
+
+    :param xml_file: file-like object of content.xml, will be read once
+    :param source_name: name of the source for logging
+    :param chunk_size: number of bytes read from xml_file at once
+    :return: generator of Product
+    :raise ET.ParseError: for invalid XML, after all products before the error are returned
+    """
+    for _, element in ET.iterparse(_RepairingReader(xml_file, source_name, chunk_size), events=('end',)):
+        if element.tag.rsplit('}', 1)[-1] == 'Product':
+            yield Product(element.get('Name'), element.get('OrderNumber'), element.get('HardwareId'))
+            element.clear()
@@ -3,67 +3,182 @@
 
 import json
 import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+
+# raw.githubusercontent.com may deliver content up to 5 minutes old after a push
+RAW_CONTENT_MAX_AGE = timedelta(minutes=5)
+
+
+class DependencyEntry(NamedTuple):
+    """One library-line of a dependencies.txt"""
+    commit: str
+    branch: str
+    path: str
+    url: str
+    dep_name: str
+    # False for lines without url, where url and dep_name are derived from lib-path
+    complete: bool = True
+
+
+class ParseDiagnostic(NamedTuple):
+    """Problem found in a line of a dependencies.txt"""
+    line_number: int
+    level: int  # logging level
+    message: str
+
+
+def parse_dependencies_txt(text) -> Tuple[List[DependencyEntry], List[ParseDiagnostic]]:
+    """
+    Parse the content of a dependencies.txt as generated by OpenKNX-Build-Process.
+
+    Format: a header line, followed by one line per lib with `commit branch path url`;
+    some older files contain lines without url, the name of the lib is then taken from the path.
+    Empty lines and comments (starting with #) are ignored.
+
+    :param text: full content of dependencies.txt
+    :return: (list of all libs, list of diagnostics for incomplete or invalid lines)
+    """
+    entries = []
+    diagnostics = []
+    lines = text.splitlines()
+    for line_number, line in enumerate(lines[1:], start=2):  # Skip the header
+        parts = line.split()
+        if not parts or parts[0].startswith('#'):
+            continue
+        if len(parts) == 4:
+            commit, branch, path, url = parts
+            # use part of https://github.com/OpenKNX/{dep_name}.git :
+            dep_name = url.split('/')[-1].replace('.git', '')
+            entries.append(DependencyEntry(commit, branch, path, url, dep_name))
+        elif len(parts) == 3:
+            commit, branch, path = parts
+            # use part after 'lib/'
+            dep_name = path.split('/')[-1]
+            entries.append(DependencyEntry(commit, branch, path, f"https://github.com/OpenKNX/{dep_name}.git", dep_name, False))
+            diagnostics.append(ParseDiagnostic(line_number, logging.WARNING, f"Incomplete line without url: '{line}'"))
+        else:
+            diagnostics.append(ParseDiagnostic(line_number, logging.ERROR, f"Invalid line: '{line}'"))
+    return entries, diagnostics
 
 
 class DependencyManager:
-    def __init__(self, client):
+    def __init__(self, client, cache_dir="releases_data", journal=None):
+        """
+        :param journal: RunJournal to skip repos already read by an interrupted run
+        """
         self.client = client
+        self.cache_dir = cache_dir
+        self.journal = journal
 
     def _is_openknx_dependency(self, url):
         # TODO check if the exclusion of external libs here is a clean solution
         return url.startswith("https://github.com/OpenKNX/")
 
-    def fetch_dependencies(self, repo):
-        dependencies_url = f"https://raw.githubusercontent.com/OpenKNX/{repo['name']}/{repo['default_branch']}/dependencies.txt"
+    def _get_cache_path(self, repo):
+        """
+        :return: path of the cache file for the state of the repo as listed, None if not cacheable
+        """
+        if not repo.pushed_at or not repo.default_branch:
+            return None
+        pushed_at = datetime.strptime(repo.pushed_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        if datetime.now(timezone.utc) - pushed_at < RAW_CONTENT_MAX_AGE:
+            return None  # content of raw.githubusercontent.com may be outdated yet
+        version = f"{repo.default_branch}@{repo.pushed_at}".replace('/', '_').replace(':', '_')
+        return os.path.join(self.cache_dir, repo.name, f"dependencies@{version}.json")
+
+    @staticmethod
+    def _remove_outdated_cache(cache_path):
+        # only the cache file of the current state of the repo is used again
+        cache_dir, current = os.path.split(cache_path)
+        for filename in os.listdir(cache_dir):
+            if filename.startswith("dependencies@") and filename.endswith(".json") and filename != current:
+                os.remove(os.path.join(cache_dir, filename))
+
+    def _read_dependencies_txt(self, repo) -> Optional[Tuple[List[DependencyEntry], List[ParseDiagnostic]]]:
+        """
+        Read and parse dependencies.txt of the default branch from raw.githubusercontent.com (no API rate limit).
+        The content can only change with a push, so the parsed result is cached by push time and default branch
+        of the repo listing, without any further API call.
+
+        :return: (entries, diagnostics) or None for repos without dependencies.txt
+        """
+        cache_path = self._get_cache_path(repo)
+        if cache_path and os.path.exists(cache_path):
+            logging.debug(f"Use cached dependencies.txt of {repo.name} pushed at {repo.pushed_at}")
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached["entries"] is None:
+                return None
+            return ([DependencyEntry(*entry) for entry in cached["entries"]],
+                    [ParseDiagnostic(*diagnostic) for diagnostic in cached["diagnostics"]])
+
+        dependencies_url = f"https://raw.githubusercontent.com/OpenKNX/{repo.name}/{repo.default_branch}/dependencies.txt"
         response = self.client.get_response(dependencies_url, True)
-        if response is None:
+        parsed = parse_dependencies_txt(response.text) if response is not None else None
+
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # complete file or none, also on interruption
+            with open(f"{cache_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump({
+                    "entries": [list(entry) for entry in parsed[0]] if parsed else None,
+                    "diagnostics": [list(diagnostic) for diagnostic in parsed[1]] if parsed else [],
+                }, f, indent=4)
+            os.replace(f"{cache_path}.tmp", cache_path)
+            self._remove_outdated_cache(cache_path)
+        return parsed
+
+    def fetch_dependencies(self, repo):
+        version = f"{repo.pushed_at}|{repo.default_branch}"
+        if self.journal is not None:
+            dependencies_map = self.journal.get("dependencies", repo.name, version)
+            if dependencies_map is not None:
+                logging.debug(f"Use dependencies of {repo.name} from journal")
+                return dependencies_map
+
+        dependencies_map = self._fetch_dependencies(repo)
+        if self.journal is not None:
+            self.journal.record("dependencies", repo.name, version, dependencies_map)
+        return dependencies_map
+
+    def _fetch_dependencies(self, repo):
+        parsed = self._read_dependencies_txt(repo)
+        if parsed is None:
             return {}
+        entries, diagnostics = parsed
+
         dependencies_map = {}
-        lines = response.text.splitlines()
-        invalid_lines_count = 0
-        incomplete_lines_count = 0
-
-        if lines:
-            for line in lines[1:]:  # Skip the header
-                parts = line.split()
-                if len(parts) == 4:
-                    commit, branch, path, url = parts
-                    # use part of https://github.com/OpenKNX/{dep_name}.git :
-                    dep_name = url.split('/')[-1].replace('.git', '')
-                    if self._is_openknx_dependency(url) and self._is_module_to_include(dep_name):
-                        dependencies_map[dep_name] = {
-                            "commit": commit,
-                            "branch": branch,
-                            "path": path,
-                            "url": url,
-                            # TODO rename to dep_name
-                            "depName": dep_name
-                        }
-                elif len(parts) == 3:
-                    commit, branch, path = parts
-                    # use part after 'lib/'
-                    dep_name = path.split('/')[-1]
-                    # special: detect by name only
-                    if self._is_module_to_include(dep_name):
-                        dependencies_map[dep_name] = {
-                            "commit": commit,
-                            "branch": branch,
-                            "path": path,
-                            "url": f"https://github.com/OpenKNX/{dep_name}.git",
-                            # TODO rename to dep_name
-                            "depName": dep_name
-                        }
-                        logging.warning(f"((>>WORKAROUND<<)) Expect module in {repo['name']} by lib-path only: '{dep_name}'")
-                    else:
-                        logging.warning(f"Unexpected lib in incomplete dependencies.txt of {repo['name']}: {dep_name}")
-                    incomplete_lines_count += 1
-                else:
-                    invalid_lines_count += 1
+        for entry in entries:
+            if entry.complete:
+                if not (self._is_openknx_dependency(entry.url) and self._is_module_to_include(entry.dep_name)):
+                    continue
+            elif self._is_module_to_include(entry.dep_name):
+                # special: detect by name only
+                logging.warning(f"((>>WORKAROUND<<)) Expect module in {repo.name} by lib-path only: '{entry.dep_name}'")
+            else:
+                logging.warning(f"Unexpected lib in incomplete dependencies.txt of {repo.name}: {entry.dep_name}")
+                continue
+            dependencies_map[entry.dep_name] = {
+                "commit": entry.commit,
+                "branch": entry.branch,
+                "path": entry.path,
+                "url": entry.url,
+                # TODO rename to dep_name
+                "depName": entry.dep_name
+            }
 
+        lines_count = len(entries) + sum(1 for d in diagnostics if d.level >= logging.ERROR)
+        incomplete_lines_count = sum(1 for d in diagnostics if d.level == logging.WARNING)
+        invalid_lines_count = sum(1 for d in diagnostics if d.level >= logging.ERROR)
+        for diagnostic in diagnostics:
+            logging.debug(f"dependencies.txt of {repo.name}, line {diagnostic.line_number}: {diagnostic.message}")
         if incomplete_lines_count > 0:
-            logging.warning(f"Incomplete dependencies.txt format in {repo['name']} ({incomplete_lines_count} of {len(lines)-1} lines)")
+            logging.warning(f"Incomplete dependencies.txt format in {repo.name} ({incomplete_lines_count} of {lines_count} lines)")
         if invalid_lines_count > 0:
-            logging.error(f"Invalid dependencies.txt format in {repo['name']} ({invalid_lines_count} of {len(lines)-1} lines)")
+            logging.error(f"Invalid dependencies.txt format in {repo.name} ({invalid_lines_count} of {lines_count} lines)")
 
         return dependencies_map
 
@@ -72,12 +187,30 @@ class DependencyManager:
             return False
         return dep_name.startswith('OFM-') or dep_name.startswith('OGM-') or dep_name == 'knx'
 
-    def fetch_all_dependencies(self, repos_data):
+    def fetch_all_dependencies(self, repos_data, reuse=None):
+        """
+        :param reuse: dependencies of repos not to fetch in this run, e.g. from load_all_dependencies()
+        """
         all_dependencies = {}
         for repo in repos_data:
-            dependencies = self.fetch_dependencies(repo)
+            if reuse is not None and repo.name in reuse:
+                dependencies = reuse[repo.name]
+            else:
+                dependencies = self.fetch_dependencies(repo)
             if dependencies:
-                all_dependencies[repo['name']] = dependencies
+                all_dependencies[repo.name] = dependencies
+        self.save_all_dependencies(all_dependencies)
+        return all_dependencies
+
+    def save_all_dependencies(self, all_dependencies):
         with open('dependencies.json', 'w') as outfile:
             json.dump(all_dependencies, outfile, indent=4)
-        return all_dependencies
+
+    def load_all_dependencies(self):
+        """
+        :return: dependencies of all OAMs as saved by the last run, empty if not available
+        """
+        if not os.path.exists('dependencies.json'):
+            return {}
+        with open('dependencies.json', 'r') as infile:
+            return json.load(infile)
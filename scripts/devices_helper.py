@@ -4,6 +4,7 @@
 import json
 import logging
 import os
+import sys
 
 
 class DeviceHelper:
@@ -14,13 +15,32 @@ class DeviceHelper:
     def is_open_device(self, device_name):
         return "OpenKNX" in device_name
 
-    def hw_name_mapping(self, oam, hw_text):
+    def find_device_name(self, oam, hw_text):
+        """
+        :return: mapped device name, None if unknown
+        """
         hw_text_oam = f"{hw_text}@{oam}"
         if hw_text_oam in self.device_name_map:
-            logging.warning(f"((>>WORKAROUND<<)) OAM-specific mapping of device-name for '{hw_text}' in '{oam}'")
-            return self.device_name_map[hw_text_oam]
+            return sys.intern(self.device_name_map[hw_text_oam])
         if hw_text in self.device_name_map:
-            return self.device_name_map[hw_text]
-        else:
+            return sys.intern(self.device_name_map[hw_text])
+        return None
+
+    def hw_name_mapping(self, oam, hw_text, product=None):
+        """
+        :param product: product of content.xml with this name (dict with order_number and hardware_id), if known;
+                        used for mapping, if the name itself is unknown
+        """
+        if f"{hw_text}@{oam}" in self.device_name_map:
+            logging.warning(f"((>>WORKAROUND<<)) OAM-specific mapping of device-name for '{hw_text}' in '{oam}'")
+        device_name = self.find_device_name(oam, hw_text)
+        if device_name is None and product:
+            for key in (product.get("order_number"), product.get("hardware_id")):
+                device_name = self.find_device_name(oam, key) if key else None
+                if device_name is not None:
+                    logging.info(f"Device Name in '{oam}' mapped by product '{key}': {hw_text} -> {device_name}")
+                    break
+        if device_name is None:
             logging.warning(f"Unknown Device Name in '{oam}': {hw_text}")
-            return f"(???)-{hw_text}"
+            return sys.intern(f"(???)-{hw_text}")
+        return device_name
@@ -0,0 +1,105 @@
+# Watch the Event-Feed of the Organisation for Changes of App-Repos
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import logging
+import time
+
+
+class OrgEventWatcher:
+    """
+    Poll /orgs/{org}/events and report app repos with relevant events.
+
+    Uses ETag for conditional requests (a 304 response does not count against the rate limit)
+    and respects the poll interval requested by GitHub via X-Poll-Interval.
+    """
+
+    RELEVANT_EVENT_TYPES = {"ReleaseEvent", "PushEvent", "CreateEvent"}
+
+    def __init__(self, client, is_app_repo_name, poll_interval=60, max_pages=3):
+        """
+        :param client: GitHubClient
+        :param is_app_repo_name: function to check if a repo name (without org) belongs to an app repo
+        :param poll_interval: minimal seconds between polls, GitHub may request longer intervals
+        :param max_pages: maximal pages to read, if more new events occurred since the last poll
+        """
+        self.client = client
+        self.is_app_repo_name = is_app_repo_name
+        self.min_poll_interval = poll_interval
+        self.poll_interval = poll_interval
+        self.max_pages = max_pages
+        self.etag = None
+        self.last_event_id = None
+
+    def _events_url(self, page):
+        return f"{self.client.base_url}/orgs/{self.client.org_name}/events?per_page=100&page={page}"
+
+    def _get_repo_name(self, event):
+        # events contain the full name: {org}/{repo}
+        return event.get("repo", {}).get("name", "").split('/')[-1]
+
+    def start(self):
+        """
+        Define the starting point before a full update: all events after it are reported by the next poll,
+        including the events occurring during the full update.
+        """
+        if self.last_event_id is None:
+            self.poll()
+
+    def poll(self):
+        """
+        Read all events since the last poll.
+
+        :return: set of app repo names with relevant events, empty for the first poll
+        """
+        headers = {'If-None-Match': self.etag} if self.etag else {}
+        response = self.client.get_response(self._events_url(1), headers=headers)
+        self.poll_interval = max(self.min_poll_interval, int(response.headers.get('X-Poll-Interval', 0)))
+        if response.status_code == 304:
+            logging.debug("No new events")
+            return set()
+        self.etag = response.headers.get('ETag')
+
+        events = response.json()
+        if self.last_event_id is None:
+            # first poll only defines the starting point, current state is covered by a full update
+            self.last_event_id = events[0]["id"] if events else "0"
+            return set()
+
+        new_events = []
+        page = 1
+        while True:
+            for event in events:
+                if int(event["id"]) <= int(self.last_event_id):
+                    break
+                new_events.append(event)
+            else:
+                page += 1
+                if events and page <= self.max_pages:
+                    events = self.client.get_json_response(self._events_url(page))
+                    continue
+                if events:
+                    logging.warning(f"More than {self.max_pages} pages of new events, older events are ignored")
+            break
+
+        if new_events:
+            self.last_event_id = new_events[0]["id"]
+        changed_repos = {
+            self._get_repo_name(event)
+            for event in new_events
+            if event.get("type") in self.RELEVANT_EVENT_TYPES and self.is_app_repo_name(self._get_repo_name(event))
+        }
+        logging.info(f"{len(new_events)} new events, relevant changes in {sorted(changed_repos)}")
+        return changed_repos
+
+    def watch(self, on_change, max_polls=None):
+        """
+        Poll endlessly (or max_polls times) and call on_change with the set of changed app repos.
+        The first poll reports the events since start(), if called before.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            changed_repos = self.poll()
+            if changed_repos:
+                on_change(changed_repos)
+            polls += 1
+            time.sleep(self.poll_interval)
@@ -0,0 +1,191 @@
+# Flash Footprint of Firmware Images in Release Archives, Read from Zip Metadata Only
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+import logging
+import os
+import zipfile
+
+FIRMWARE_EXTENSIONS = ('.uf2', '.bin', '.hex', '.elf')
+
+
+class HttpRangeFile:
+    """
+    Read-only, seekable file over HTTP Range requests, usable by zipfile.
+
+    The first request reads the tail of the file, which contains the end record and, for the
+    archives of OpenKNX releases, the complete central directory. So listing the members of
+    an archive usually costs one request of some KB, without downloading the archive.
+    """
+
+    def __init__(self, client, url, tail_size=64 * 1024):
+        self.client = client
+        self.url = url
+        self.position = 0
+        self.transferred_bytes = 0
+        response = client.get_response(url, headers={'Range': f'bytes=-{tail_size}'})
+        if response.status_code == 206:
+            self.size = int(response.headers['Content-Range'].rsplit('/', 1)[1])
+            self._set_buffer(self.size - len(response.content), response.content)
+        else:
+            # no range support: complete content
+            self.size = len(response.content)
+            self._set_buffer(0, response.content)
+
+    def _set_buffer(self, start, data):
+        self._buffer_start = start
+        self._buffer = data
+        self.transferred_bytes += len(data)
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = max(0, min(offset, self.size))
+        return self.position
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self.position + size, self.size)
+        if end <= self.position:
+            return b''
+        buffer_end = self._buffer_start + len(self._buffer)
+        if self.position < self._buffer_start or end > buffer_end:
+            response = self.client.get_response(self.url, headers={'Range': f'bytes={self.position}-{end - 1}'})
+            if response.status_code == 206:
+                self._set_buffer(self.position, response.content)
+            else:
+                self._set_buffer(0, response.content)
+        data = self._buffer[self.position - self._buffer_start:end - self._buffer_start]
+        self.position += len(data)
+        return data
+
+
+def read_firmware_images(zip_file):
+    """
+    :param zip_file: zipfile.ZipFile; only the central directory is used, nothing is decompressed
+    :return: list of dict with file, file_size, compress_size for all firmware images
+    """
+    return [
+        {"file": info.filename.replace('\\', '/'), "file_size": info.file_size, "compress_size": info.compress_size}
+        for info in zip_file.infolist()
+        if info.filename.lower().endswith(FIRMWARE_EXTENSIONS)
+    ]
+
+
+def firmware_stem(filename):
+    """
+    :return: name of the firmware image without path, extension and 'firmware-' prefix, e.g. 'REG1_BASE_V1'
+    """
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    for prefix in ("firmware-", "firmware_"):
+        if stem.lower().startswith(prefix):
+            return stem[len(prefix):]
+    return stem
+
+
+class FirmwareFootprint:
+    """
+    Sizes of all firmware images of all releases, per OAM and per device.
+    The images of each release archive are cached by asset digest, as the content of an asset never changes.
+    """
+
+    def __init__(self, client, cache_path=os.path.join("releases_data", "firmware_footprint.json")):
+        self.client = client
+        self.cache_path = cache_path
+        self.cache = {}
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+
+    @staticmethod
+    def _asset_key(asset):
+        return asset.digest or f"{asset.name}__{asset.updated_at}__{asset.size}"
+
+    def _read_asset_images(self, oam, asset):
+        key = self._asset_key(asset)
+        if key not in self.cache:
+            range_file = HttpRangeFile(self.client, asset.browser_download_url)
+            try:
+                self.cache[key] = read_firmware_images(zipfile.ZipFile(range_file))
+            except zipfile.BadZipFile as e:
+                logging.warning(f"Firmware footprint of {oam} {asset.name} not readable: {e}")
+                self.cache[key] = []
+            logging.info(f"Firmware footprint of {oam} {asset.name}: {len(self.cache[key])} images, "
+                         f"{range_file.transferred_bytes} of {range_file.size} bytes read")
+        return self.cache[key]
+
+    @staticmethod
+    def _device_by_firmware(hardware_raw, hardware):
+        """
+        :param hardware_raw: product names of the release, as in content.xml
+        :param hardware: mapped device names, in the same order
+        :return: dict firmware name (lower case) -> device name
+        """
+        return {name.lower(): device for name, device in zip(hardware_raw or [], hardware or [])}
+
+    def analyse(self, oam_releases_data, oam_hardware_raw, oam_hardware):
+        """
+        Images are assigned to devices by the hardware mapping of the OAM (products of the latest release, see
+        process_release_zip), matching the product name with the name of the firmware image.
+
+        :param oam_releases_data: dict OAM-name -> OamRecord
+        :param oam_hardware_raw: dict OAM-name -> product names of the latest release
+        :param oam_hardware: dict OAM-name -> mapped device names, in the same order
+        :return: dict OAM-name -> list of releases (newest first) with images, each with device (None if unknown)
+        """
+        footprints = {}
+        used_keys = set()
+        for oam, oam_data in oam_releases_data.items():
+            device_by_firmware = self._device_by_firmware(oam_hardware_raw.get(oam), oam_hardware.get(oam))
+            unmapped = set()
+            releases = []
+            for release in oam_data.releases:
+                if not release.assets:
+                    continue
+                asset = release.assets[0]
+                used_keys.add(self._asset_key(asset))
+                images = []
+                for image in self._read_asset_images(oam, asset):
+                    stem = firmware_stem(image["file"])
+                    device = device_by_firmware.get(stem.lower()) or \
+                        device_by_firmware.get(os.path.splitext(os.path.basename(image["file"]))[0].lower())
+                    if device is None:
+                        unmapped.add(stem)
+                    images.append(dict(image, device=device))
+                releases.append({
+                    "tag_name": release.tag_name,
+                    "prerelease": bool(release.prerelease),
+                    "published_at": release.published_at,
+                    "images": images,
+                })
+            if any(release["images"] for release in releases):
+                footprints[oam] = releases
+            if unmapped:
+                logging.warning(f"Firmware footprint of {oam}: no device in hardware mapping for images {sorted(unmapped)}")
+
+        # keep only assets of existing releases
+        self.cache = {key: images for key, images in self.cache.items() if key in used_keys}
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        return footprints
+
+    @staticmethod
+    def by_device(footprints):
+        """
+        :return: dict device-name -> list of images of the newest release of each OAM containing an image for this device
+        """
+        devices = {}
+        for oam, releases in footprints.items():
+            latest = next((release for release in releases if release["images"]), None)
+            for image in latest["images"] if latest else []:
+                if image["device"]:
+                    devices.setdefault(image["device"], []).append(dict(image, oam=oam, tag_name=latest["tag_name"]))
+        return dict(sorted(devices.items()))
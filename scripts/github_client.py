@@ -7,27 +7,30 @@ import time
 
 import requests
 
+from rate_limit import RateLimitBudget, RateLimitExhausted
+
 
 class GitHubClient:
     def __init__(self, base_url="https://api.github.com", org_name="OpenKNX"):
         self.base_url = base_url
         self.org_name = org_name
+        self.budget = RateLimitBudget()
 
-    def get_response(self, url, allowed_not_found=False):
+    def get_response(self, url, allowed_not_found=False, headers=None, stream=False):
         response = None
         try:
-            headers = {'X-GitHub-Api-Version': '2022-11-28'}
-            response = requests.get(url, headers=headers)
+            headers = {'X-GitHub-Api-Version': '2022-11-28', **(headers or {})}
+            response = requests.get(url, headers=headers, stream=stream)
             if response.status_code == 403 and 'X-RateLimit-Reset' in response.headers:
                 # Try again 5 seconds after rate limit end
                 wait_time = max(0, int(response.headers['X-RateLimit-Reset']) - int(time.time()))
                 if wait_time > 60:
-                    error_message = f"Rate limit exceeded. Wait time {wait_time}s is too long!"
-                    logging.error(error_message)
-                    sys.exit(error_message)
+                    self.budget.update(response.headers)
+                    raise RateLimitExhausted(f"Rate limit exceeded. Wait time {wait_time}s is too long!")
                 logging.warning(f"Rate limit exceeded. Waiting for {wait_time} seconds.")
                 time.sleep(wait_time + 5)
-                response = requests.get(url, headers=headers)
+                response = requests.get(url, headers=headers, stream=stream)
+            self.budget.update(response.headers)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
@@ -38,12 +41,49 @@ class GitHubClient:
             logging.error(error_message)
             sys.exit(error_message)
 
+    def download(self, url, target, chunk_size=64 * 1024):
+        """
+        Stream the content of url into the writable file-like target, without holding the complete content in memory.
+
+        :return: number of bytes written
+        """
+        response = self.get_response(url, stream=True)
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                target.write(chunk)
+                size += len(chunk)
+        finally:
+            response.close()
+        return size
+
     def get_json_response(self, url):
         return self.get_response(url).json()
 
-    def fetch_org_repos_page(self, repos_list, per_page=100, page=1):
+    def get_repo(self, repo_name):
+        """
+        :return: structured repo data, or None if the repo does not exist
+        """
+        response = self.get_response(f"{self.base_url}/repos/{self.org_name}/{repo_name}", True)
+        return response.json() if response is not None else None
+
+    def get_branch_head_sha(self, repo_name, branch):
+        """
+        Read only the commit-SHA of the head of a branch, without any further commit-data.
+
+        :return: SHA as string, or None if repo or branch does not exist
+        """
+        url = f"{self.base_url}/repos/{self.org_name}/{repo_name}/commits/{branch}"
+        response = self.get_response(url, True, headers={'Accept': 'application/vnd.github.sha'})
+        if response is None:
+            return None
+        return response.text.strip()
+
+    def fetch_org_repos_page(self, repos_list, per_page=100, page=1, sort=None):
         logging.info(f"Repo-list: Read page {page} ...")
         repos_url = f"{self.base_url}/orgs/{self.org_name}/repos?per_page={per_page}&type=public&page={page}"
+        if sort is not None:
+            repos_url += f"&sort={sort}&direction=desc"
         repos_data = self.get_json_response(repos_url)
         repos_list.extend(repos_data)
         return len(repos_data)
@@ -56,3 +96,21 @@ class GitHubClient:
             page += 1
         logging.info(f"Found {len(all_repos)} repos on {page} pages")
         return all_repos
+
+    def get_org_repos_pushed_since(self, since):
+        """
+        Read repos ordered by push time (newest first) and stop paging at the first repo pushed before since.
+
+        :param since: time as ISO-string, like pushed_at
+        :return: list of structured repo data with pushed_at >= since
+        """
+        per_page = 100
+        page = 1
+        repos = []
+        while True:
+            page_repos = []
+            count = self.fetch_org_repos_page(page_repos, per_page, page, sort="pushed")
+            repos.extend(repo for repo in page_repos if (repo.get("pushed_at") or "") >= since)
+            if count < per_page or (page_repos[-1].get("pushed_at") or "") < since:
+                return repos
+            page += 1
@@ -2,17 +2,23 @@
 # (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
 
 import logging
+import os
 
 from jinja2 import Environment, FileSystemLoader
 
+from membership_matrix import MembershipMatrix
 from path_manager import PathManager
+from release_body_renderer import ReleaseBodyRenderer
+from search_index import SearchIndexBuilder
 
 
 class HTMLGenerator:
-    def __init__(self, device_helper):
+    RELEASES_PER_PAGE = 10
+
+    def __init__(self, device_helper, path_manager=None):
         self.env = Environment(loader=FileSystemLoader('templates'))
         self.device_helper = device_helper
-        self.path_manager = PathManager()  # Instanz von PathManager
+        self.path_manager = path_manager or PathManager()  # Instanz von PathManager
 
         def remove_openknx_from_devicename(value):
             """Remove prefix from string if it exists."""
@@ -35,30 +41,22 @@ class HTMLGenerator:
         template = self.env.get_template(template_name)
         html_content = template.render(**context)
 
-        with open(output_filename, 'w', encoding='utf8') as file:
+        with self.path_manager.open_output(output_filename) as file:
             file.write(html_content)
 
         return html_content
 
-    def create_html_for_repo(self, oam, oam_releases):
+    def create_html_for_repo(self, oam, latest_release, latest_prerelease):
         """
         Erzeugt zu jedem Repo eine kleine HTML-Datei mit Ausgabe des aktuellsten Release.
         Ein Pre-Release wird nur dann mit ausgegeben, wenn es neuer ist als das neuste Release, oder noch kein reguläres existiert
 
         :param oam:
-        :param oam_releases:
+        :param latest_release: neustes reguläres Release, siehe OamRecord.latest_release
+        :param latest_prerelease: neustes Pre-Release, siehe OamRecord.latest_prerelease
         :return:
         """
         logging.info(f"Creating HTML for repository {oam}")
-        latest_release = None
-        latest_prerelease = None
-        for release in oam_releases:
-            if not release["prerelease"]:
-                if latest_release is None or release["published_at"] > latest_release["published_at"]:
-                    latest_release = release
-            else:
-                if latest_prerelease is None or release["published_at"] > latest_prerelease["published_at"]:
-                    latest_prerelease = release
 
         # create release info for this repo
         output_filename = self.path_manager.get_oam_path(oam, filename='releases_latest.html')
@@ -77,17 +75,165 @@ class HTMLGenerator:
                                       latest_prerelease=latest_prerelease
                                       )
 
+    @staticmethod
+    def get_release_page_filename(page):
+        return "releases.html" if page == 1 else f"releases_{page}.html"
+
+    def create_release_history_for_repo(self, oam, oam_releases, body_renderer):
+        """
+        Erzeugt die Release-Historie eines Repos, aufgeteilt auf Seiten mit je RELEASES_PER_PAGE Releases.
+        Nicht mehr benötigte Seiten (z.B. nach Löschen von Releases) werden entfernt.
+        """
+        page_count = max(1, -(-len(oam_releases) // self.RELEASES_PER_PAGE))
+        for page in range(1, page_count + 1):
+            page_releases = oam_releases[(page - 1) * self.RELEASES_PER_PAGE:page * self.RELEASES_PER_PAGE]
+            self._render_template_to_file('oam_releases.html',
+                                          self.path_manager.get_oam_path(oam, filename=self.get_release_page_filename(page)),
+                                          oamName=oam,
+                                          releases=[(release, body_renderer.to_html(release.body)) for release in page_releases],
+                                          page=page,
+                                          page_count=page_count,
+                                          page_filename=self.get_release_page_filename,
+                                          )
+        page = page_count + 1
+        while os.path.exists(self.path_manager.get_oam_path(oam, filename=self.get_release_page_filename(page))):
+            os.unlink(self.path_manager.get_oam_path(oam, filename=self.get_release_page_filename(page)))
+            page += 1
+
     def update_html(self, releases_data):
+        """
+        :param releases_data: dict OAM-name -> OamRecord
+        """
         logging.info("Updating HTML with release data")
+        self.update_html_overview(releases_data)
 
+        # current releases htmls for apps:
+        body_renderer = ReleaseBodyRenderer()
+        for repo, details in releases_data.items():
+            self.update_html_for_repo(repo, details, body_renderer)
+        body_renderer.save()
+
+    def update_html_overview(self, releases_data):
+        self.path_manager.plan_directories("oam", releases_data.keys())
         output_filename = self.path_manager.create_path(filename='releases_list.html')
         self._render_template_to_file('release_template.html', output_filename,
-                                      releases_data=releases_data
+                                      releases_data=releases_data,
                                       )
 
-        # current releases htmls for apps:
-        for repo, details in releases_data.items():
-            self.create_html_for_repo(repo, details["releases"])
+    def update_html_for_repo(self, repo, details, body_renderer):
+        """
+        Erzeugt alle Release-Seiten eines einzelnen Repos.
+
+        :param details: OamRecord des Repos
+        """
+        self.create_html_for_repo(repo, details.latest_release, details.latest_prerelease)
+        self.create_release_history_for_repo(repo, details.releases, body_renderer)
+
+    def update_sizing_trends(self, history):
+        """
+        Create trend pages for the App-Sizing-Statistics over all releases of each OAM, and an overview with the
+        latest values of all OAMs.
+
+        :param history: AppSizingHistory
+        """
+        # most relevant values for device limits and ETS-performance
+        metrics = [
+            ("parameter_memory_size", "Parameter-Speicher"),
+            ("com_object_count", "KOs"),
+            ("com_object_ref_count", "KO-Refs"),
+            ("parameter_count", "Parameter"),
+            ("script_size", "Script"),
+            ("file_size", "XML-Größe"),
+        ]
+        growth_alerts = history.growth_alerts()
+        latest_values = {}
+        for oam in history.oam_names:
+            releases = history.to_trend_json(oam)["releases"]
+            if not releases:
+                continue
+            latest_values[oam] = releases[-1]
+            file = self.path_manager.get_oam_path(oam, filename='sizing.html')
+            logging.info(f"Create App-Sizing-Trend in {file}")
+            self._render_template_to_file('oam_sizing_trend.html', file,
+                                          oamName=oam,
+                                          metrics=metrics,
+                                          releases=releases,
+                                          growth_alert=growth_alerts.get(oam),
+                                          )
+
+        self._render_template_to_file('sizing_overview.html',
+                                      self.path_manager.create_path(filename='sizing.html'),
+                                      metrics=metrics,
+                                      latest_values=latest_values,
+                                      growth_alerts=growth_alerts,
+                                      )
+
+    def update_firmware_footprint(self, footprints, devices):
+        """
+        Create footprint tables of the firmware images per OAM (all releases) and per device (newest release of each OAM).
+
+        :param footprints: see FirmwareFootprint.analyse()
+        :param devices: see FirmwareFootprint.by_device()
+        """
+        for oam, releases in footprints.items():
+            # one column per image file name, newest release first
+            files = sorted({image["file"] for release in releases for image in release["images"]})
+            file_devices = {image["file"]: image["device"] for release in releases for image in release["images"]}
+            file = self.path_manager.get_oam_path(oam, filename='footprint.html')
+            logging.info(f"Create Firmware-Footprint in {file}")
+            self._render_template_to_file('oam_footprint.html', file,
+                                          oamName=oam,
+                                          files=[(name, file_devices[name]) for name in files],
+                                          releases=[(release, {image["file"]: image for image in release["images"]})
+                                                    for release in releases],
+                                          )
+
+        linked_devices = [device for device in devices if self.path_manager.is_planned("devices", device)]
+        for device in linked_devices:
+            file = self.path_manager.get_device_path(device, filename='footprint.html')
+            self._render_template_to_file('device_footprint.html', file,
+                                          name=device,
+                                          images=sorted(devices[device], key=lambda image: -image["file_size"]),
+                                          )
+
+        self._render_template_to_file('footprint_overview.html',
+                                      self.path_manager.create_path(filename='footprint.html'),
+                                      oam_names=list(footprints.keys()),
+                                      devices=devices,
+                                      linked_devices=set(linked_devices),
+                                      function_device_to_pathname=PathManager.to_device_pathname,
+                                      )
+
+    def update_ofm_drift(self, drift, oam_drift):
+        """
+        Create the drift pages of the pinned OFM commits per OFM, per OAM and as overview.
+
+        :param drift: see OfmDrift.analyse()
+        :param oam_drift: see OfmDrift.by_oam()
+        """
+        linked_ofms = {ofm for ofm in drift if self.path_manager.is_planned("ofm", ofm)}
+        linked_oams = {oam for oam in oam_drift if self.path_manager.is_planned("oam", oam)}
+        for ofm in linked_ofms:
+            file = self.path_manager.get_ofm_path(ofm, filename='drift.html')
+            logging.info(f"Create OFM-Drift in {file}")
+            self._render_template_to_file('ofm_drift.html', file,
+                                          ofmName=ofm,
+                                          head=drift[ofm]["head"],
+                                          # most outdated first
+                                          pins=sorted(drift[ofm]["pins"].items(), key=lambda item: -(item[1]["behind_by"] or 0)),
+                                          linked_oams=linked_oams,
+                                          )
+        for oam in linked_oams:
+            self._render_template_to_file('oam_drift.html', self.path_manager.get_oam_path(oam, filename='drift.html'),
+                                          oamName=oam,
+                                          pins=oam_drift[oam],
+                                          heads={ofm: drift[ofm]["head"] for ofm in oam_drift[oam]},
+                                          linked_ofms=linked_ofms,
+                                          )
+        self._render_template_to_file('drift_overview.html', self.path_manager.create_path(filename='drift.html'),
+                                      drift=drift,
+                                      linked_ofms=linked_ofms,
+                                      )
 
     def update_overview_tables(self, oam_data, ofm_data):
         # module,devices -> usage_count
@@ -116,6 +262,13 @@ class HTMLGenerator:
         logging.debug(f"Devices (OpenKNX) sorted: {devices_sorted}")
         logging.debug(f"Devices (other) sorted: {devices_other_sorted}")
 
+        matrix = MembershipMatrix(oam_data, [module for module, _ in modules_sorted],
+                                  [device for device, _ in devices_sorted + devices_other_sorted])
+
+        self.path_manager.plan_directories("oam", oam_data.keys())
+        self.path_manager.plan_directories("ofm", [module for module, _ in modules_sorted])
+        self.path_manager.plan_directories("devices", [device for device, _ in devices_sorted])
+
         render_configs = [
             (True, True, "dependencies_table.html", "OpenKNX-Applikationen, enthaltene Module und unterstützte Geräte"),
             (True, False, "oam2ofm.html", "OpenKNX-Applikationen und enthaltene Module"),
@@ -130,7 +283,10 @@ class HTMLGenerator:
                 modules_sorted=modules_sorted if showModules else [],
                 devices_sorted=devices_sorted if showDevices else [],
                 devices_other_sorted=devices_other_sorted if showDevices else [],
-                oam_data=oam_data,
+                rows=self._dependency_table_rows(matrix, matrix.oam_names, oam_data, ofm_data,
+                                                 modules_sorted if showModules else [],
+                                                 devices_sorted if showDevices else [],
+                                                 devices_other_sorted if showDevices else []),
                 ofm_data=ofm_data,
                 showModules=showModules,
                 showDevices=showDevices,
@@ -163,11 +319,10 @@ class HTMLGenerator:
 
             from collections import defaultdict
             dev_usage_count = defaultdict(int)
-            for oam, oam_details in oam_data.items():
-                # use supported devices of all oams with this module:
-                if ofmName in oam_details["modules"]:
-                    for dev in oam_details["devices"]:
-                        dev_usage_count[dev] += 1
+            # use supported devices of all oams with this module:
+            for oam in matrix.oams_with_module(ofmName):
+                for dev in oam_data[oam]["devices"]:
+                    dev_usage_count[dev] += 1
             devs_sorted = sorted(dev_usage_count.items(), key=lambda item: (-item[1], item[0]))
 
             file = self.path_manager.get_ofm_path(ofmName, filename='index.html')
@@ -182,22 +337,15 @@ class HTMLGenerator:
                                           function_device_to_pathname=PathManager.to_device_pathname,
                                           )
 
-            oam_data_of_ofm = {
-                oam_name: oam_details
-                for oam_name, oam_details in oam_data.items() if ofmName in oam_details['modules']
-            }
-            modules_of_device = {
-                module
-                for oam_details in oam_data_of_ofm.values()
-                for module in oam_details["modules"]
-            }
             self._render_template_to_file('dependencies_template.html',
                                           self.path_manager.get_ofm_path(ofmName, 'functions.html'),
                                           title=f"{ofmName}: Verfügbarkeit",
                                           # modules_sorted=modules_sorted_of_device,
                                           devices_sorted=devices_sorted,
                                           devices_other_sorted=devices_other_sorted,
-                                          oam_data=oam_data_of_ofm,
+                                          rows=self._dependency_table_rows(matrix, matrix.oams_with_module(ofmName),
+                                                                           oam_data, ofm_data, [],
+                                                                           devices_sorted, devices_other_sorted),
                                           ofm_data=ofm_data,
                                           showModules=False,
                                           showDevices=True,
@@ -211,15 +359,17 @@ class HTMLGenerator:
 
         # create overview- and function-page for each device
         logging.info(f"Create Devices Overviews...")
+        module_names = [module for module, _ in modules_sorted]
+        module_indices = matrix.module_columns(module_names)
         for device_name, usageCount in devices_sorted:
 
             from collections import defaultdict
             ofm_usage_count = defaultdict(int)
-            for oam, oam_details in oam_data.items():
-                # use supported devices of all oams with this module:
-                if device_name in oam_details["devices"]:
-                    for ofm in oam_details["modules"]:
-                        ofm_usage_count[ofm] += 1
+            # use modules of all oams supporting this device:
+            oams_of_device = matrix.oams_with_device(device_name)
+            for oam in oams_of_device:
+                for ofm in oam_data[oam]["modules"]:
+                    ofm_usage_count[ofm] += 1
             devs_sorted = sorted(ofm_usage_count.items(), key=lambda item: (-item[1], item[0]))
             # TODO use device-id?
             file = self.path_manager.get_device_path(device_name, filename="index.html")
@@ -230,15 +380,10 @@ class HTMLGenerator:
                                           ofm_sorted=devs_sorted
                                           )
 
-            oam_data_of_device = {
-                oam_name: oam_details
-                for oam_name, oam_details in oam_data.items() if device_name in oam_details['devices']
-            }
-            modules_of_device = {
-                module
-                for oam_details in oam_data_of_device.values()
-                for module in oam_details["modules"]
-            }
+            # column subset: modules used by at least one of the OAMs
+            modules_of_device = set().union(*(
+                matrix.select(oam_name, module_names, module_indices) for oam_name in oams_of_device
+            ))
             modules_sorted_of_device = [module for module in modules_sorted if module[0] in modules_of_device]
             self._render_template_to_file('dependencies_template.html',
                                           self.path_manager.get_device_path(device_name, 'functions.html'),
@@ -246,7 +391,8 @@ class HTMLGenerator:
                                           modules_sorted=modules_sorted_of_device,
                                           # devices_sorted=devices_sorted,
                                           # devices_other_sorted=devices_other_sorted,
-                                          oam_data=oam_data_of_device,
+                                          rows=self._dependency_table_rows(matrix, oams_of_device, oam_data, ofm_data,
+                                                                           modules_sorted_of_device, [], []),
                                           ofm_data=ofm_data,
                                           showModules=True,
                                           showDevices=False,
@@ -258,3 +404,72 @@ class HTMLGenerator:
                                       devices_sorted=devices_sorted,
                                       function_device_to_pathname=PathManager.to_device_pathname,
                                       )
+
+        self.update_search_index(oam_data, ofm_data, modules_sorted, devices_sorted)
+
+    @staticmethod
+    def _dependency_table_rows(matrix, oam_names, oam_data, ofm_data, modules_sorted, devices_sorted, devices_other_sorted):
+        """
+        Prepare the rows of dependencies_template.html with all cells, so the template needs no membership lookups.
+        Modules and devices used by a single OAM only are listed in a combined cell instead of own columns.
+        """
+        def ofm_cell(name, key):
+            ofm = ofm_data.get(key)
+            return {
+                "name": name,
+                "icon_url": getattr(ofm, "icon_url", "") if ofm else "",
+                "description": getattr(ofm, "description", "") if ofm else "",
+            }
+
+        module_columns = [module for module, count in modules_sorted if count > 1]
+        single_modules = [module for module, count in modules_sorted if count == 1]
+        device_columns = [device for device, count in devices_sorted if count > 1]
+        single_devices = [device for device, count in devices_sorted if count == 1]
+        other_devices = [device for device, _ in devices_other_sorted]
+
+        # column indices once per table, rows use only bit-tests
+        module_column_indices = matrix.module_columns(module_columns)
+        single_module_indices = matrix.module_columns(single_modules)
+        device_column_indices = matrix.device_columns(device_columns)
+        single_device_indices = matrix.device_columns(single_devices)
+        other_device_indices = matrix.device_columns(other_devices)
+
+        rows = []
+        for oam_name in oam_names:
+            oam_details = oam_data[oam_name]
+            rows.append({
+                "name": oam_name,
+                "description": oam_details["description"],
+                "module_cells": list(zip(module_columns, matrix.cells(oam_name, module_column_indices))),
+                "single_modules": [ofm_cell(module, module)
+                                   for module in matrix.select(oam_name, single_modules, single_module_indices)],
+                "internal_modules": [ofm_cell(module, f"{oam_name}/{module}")
+                                     for module in oam_details["modules_internal"]],
+                "device_cells": list(zip(device_columns, matrix.cells(oam_name, device_column_indices))),
+                "single_devices": matrix.select(oam_name, single_devices, single_device_indices),
+                "other_devices": matrix.select(oam_name, other_devices, other_device_indices),
+            })
+        return rows
+
+    def update_search_index(self, oam_data, ofm_data, modules_sorted, devices_sorted):
+        """
+        Create the search page with prebuilt index for all pages of OAMs, OFMs and devices.
+        """
+        logging.info(f"Create Search Index")
+        index = SearchIndexBuilder()
+        for oamName, oam_details in oam_data.items():
+            index.add_document(f"/oam/{oamName}/", oamName, "oam", oam_details["description"])
+        for ofmName, _ in modules_sorted:
+            ofm = ofm_data.get(ofmName)
+            index.add_document(f"/ofm/{ofmName}/", ofmName, "ofm",
+                               getattr(ofm, "title", None), getattr(ofm, "description", None), getattr(ofm, "prefix", None))
+        for ofmName, ofm in ofm_data.items():
+            # internal modules have no own page, use page of the OAM
+            if getattr(ofm, "parent_oam", None) in oam_data:
+                index.add_document(f"/oam/{ofm.parent_oam}/", f"{ofm.name} ({ofm.parent_oam})", "ofm",
+                                   getattr(ofm, "title", None), getattr(ofm, "description", None), getattr(ofm, "prefix", None))
+        for device_name, _ in devices_sorted:
+            index.add_document(f"/devices/{PathManager.to_device_pathname(device_name)}/", device_name, "device")
+
+        index.write(self.path_manager.create_path("search"))
+        self._render_template_to_file('search.html', self.path_manager.create_path("search", filename='index.html'))
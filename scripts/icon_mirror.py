@@ -0,0 +1,139 @@
+# Mirror OFM-Icons from GitHub to Local Assets of the Pages
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class IconMirror:
+    """
+    Fetch all icons referenced by icon_url in ofm_data and store them content-addressed in docs/img/icons/.
+
+    Requests are conditional (ETag/Last-Modified from the manifest of the last run), so unchanged icons cost
+    only a 304. Identical icons used by several OFMs are stored once. Optionally all icons are packed into a
+    single SVG sprite, referenced by fragment (sprite.svg#<id>), so pages need only one request for all icons.
+    """
+
+    SPRITE_FILENAME = "sprite.svg"
+    SPRITE_CELL_SIZE = 64
+
+    def __init__(self, path_manager, sprite=False, max_workers=8,
+                 manifest_path=os.path.join("releases_data", "icons.json")):
+        self.path_manager = path_manager
+        self.sprite = sprite
+        self.max_workers = max_workers
+        self.manifest_path = manifest_path
+        self.manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        self.session = requests.Session()
+
+    def _icon_path(self, content_hash):
+        return self.path_manager.create_path("img", "icons", filename=f"{content_hash}.png")
+
+    def _fetch(self, url):
+        """
+        :return: (url, manifest entry) with manifest entry None for missing icons (404/410),
+                 the entry of the last run if the icon could not be fetched
+        """
+        cached = self.manifest.get(url)
+        headers = {}
+        if cached and os.path.exists(self._icon_path(cached["hash"])):
+            if cached.get("etag"):
+                headers['If-None-Match'] = cached["etag"]
+            if cached.get("last_modified"):
+                headers['If-Modified-Since'] = cached["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=30)
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Icon not reachable, use last known state: {url} ({e})")
+            return url, cached
+        if response.status_code == 304:
+            return url, cached
+        if response.status_code in (404, 410):
+            logging.debug(f"Icon {url}: HTTP {response.status_code}")
+            return url, None
+        if response.status_code != 200:
+            # rate limit, server error, ...: icon not known as missing, so keep it
+            logging.warning(f"Icon not available, use last known state: {url} (HTTP {response.status_code})")
+            return url, cached
+
+        content_hash = hashlib.sha256(response.content).hexdigest()[:16]
+        icon_path = self._icon_path(content_hash)
+        if not os.path.exists(icon_path):
+            with open(icon_path, 'wb') as f:
+                f.write(response.content)
+        return url, {
+            "hash": content_hash,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+        }
+
+    def _write_sprite(self, hashes):
+        """
+        Pack all icons as embedded images into one SVG, with a <view> per icon for access by fragment identifier.
+        """
+        size = self.SPRITE_CELL_SIZE
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size * len(hashes)}">']
+        for index, content_hash in enumerate(hashes):
+            with open(self._icon_path(content_hash), 'rb') as f:
+                data = base64.b64encode(f.read()).decode('ascii')
+            y = index * size
+            parts.append(f'<view id="i{content_hash}" viewBox="0 {y} {size} {size}"/>')
+            parts.append(f'<image x="0" y="{y}" width="{size}" height="{size}" href="data:image/png;base64,{data}"/>')
+        parts.append('</svg>')
+        sprite_path = self.path_manager.create_path("img", "icons", filename=self.SPRITE_FILENAME)
+        with self.path_manager.open_output(sprite_path) as f:
+            f.write('\n'.join(parts))
+
+    def _remove_unused(self, hashes):
+        icons_dir = self.path_manager.create_path("img", "icons")
+        for filename in os.listdir(icons_dir):
+            if filename.endswith('.png') and filename[:-len('.png')] not in hashes:
+                os.unlink(os.path.join(icons_dir, filename))
+        if not self.sprite and os.path.exists(os.path.join(icons_dir, self.SPRITE_FILENAME)):
+            os.unlink(os.path.join(icons_dir, self.SPRITE_FILENAME))
+
+    def mirror(self, ofm_data):
+        """
+        Fetch all icons and rewrite icon_url of ofm_data (OfmRecord) to the local assets.
+        OFMs with missing icons are reported and get no icon_url.
+
+        :return: list of names of OFMs with missing icon
+        """
+        urls = sorted({ofm.icon_url for ofm in ofm_data.values() if hasattr(ofm, "icon_url")})
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = dict(executor.map(self._fetch, urls))
+
+        self.manifest = {url: entry for url, entry in results.items() if entry}
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=4)
+
+        hashes = sorted({entry["hash"] for entry in self.manifest.values()})
+        if self.sprite:
+            self._write_sprite(hashes)
+        self._remove_unused(hashes)
+
+        missing = []
+        for ofm_name, ofm in ofm_data.items():
+            if not hasattr(ofm, "icon_url"):
+                continue
+            entry = self.manifest.get(ofm.icon_url)
+            if entry is None:
+                missing.append(ofm_name)
+                logging.error(f"Missing icon '{ofm.icon}' of {ofm_name}: {ofm.icon_url}")
+                del ofm.icon_url
+            elif self.sprite:
+                ofm.icon_url = f"/img/icons/{self.SPRITE_FILENAME}#i{entry['hash']}"
+            else:
+                ofm.icon_url = f"/img/icons/{entry['hash']}.png"
+        logging.info(f"Mirrored {len(hashes)} distinct icons of {len(urls)} icon urls, {len(missing)} missing")
+        return missing
@@ -0,0 +1,222 @@
+# Validate Internal and External Links of the Generated Pages and JSON Outputs
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+#
+# Usage: python scripts/link_validator.py [docs] [--no-external] [--report=releases_data/link_report.json]
+
+import gzip
+import json
+import logging
+import os
+import posixpath
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# keys of JSON outputs containing links
+JSON_URL_KEYS = {"html_url", "browser_download_url", "repo_url", "icon_url", "url", "home_page_url", "feed_url"}
+LINK_ATTRIBUTES = {"href", "src"}
+IGNORED_SCHEMES = {"mailto", "javascript", "data", "tel"}
+
+
+class _LinkParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name in LINK_ATTRIBUTES and value:
+                self.links.append(value)
+
+
+def _collect_json_links(data, links):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in JSON_URL_KEYS and isinstance(value, str):
+                links.append(value)
+            else:
+                _collect_json_links(value, links)
+    elif isinstance(data, list):
+        for value in data:
+            _collect_json_links(value, links)
+
+
+class LinkValidator:
+    """
+    Internal links are resolved against the file tree of the site, read once into memory.
+    External links are checked with HEAD requests over a shared connection pool, concurrently but limited per host.
+    Successful checks are cached for cache_ttl seconds, failed ones are checked again in every run.
+    """
+
+    def __init__(self, site_dir="docs", cache_path=os.path.join("releases_data", "link_cache.json"),
+                 cache_ttl=24 * 60 * 60, max_workers=32, max_per_host=8, timeout=15):
+        self.site_dir = site_dir
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.cache = {}
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        self._host_limits = defaultdict(lambda: threading.BoundedSemaphore(self.max_per_host))
+        self._host_limits_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _read_site(self):
+        """
+        :return: (set of all site-relative file paths, dict page path -> list of links)
+        """
+        files = set()
+        links_by_page = {}
+        for dir_path, _, filenames in os.walk(self.site_dir):
+            for filename in filenames:
+                path = os.path.join(dir_path, filename)
+                rel_path = os.path.relpath(path, self.site_dir).replace(os.sep, '/')
+                files.add(rel_path)
+                if filename.endswith('.html'):
+                    parser = _LinkParser()
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        parser.feed(f.read())
+                    links_by_page[rel_path] = parser.links
+                elif filename.endswith('.json') or filename.endswith('.json.gz'):
+                    opener = gzip.open if filename.endswith('.gz') else open
+                    try:
+                        with opener(path, 'rt', encoding='utf-8') as f:
+                            data = json.load(f)
+                    except ValueError as e:
+                        logging.warning(f"Invalid JSON {rel_path}: {e}")
+                        continue
+                    links = []
+                    _collect_json_links(data, links)
+                    links_by_page[rel_path] = links
+        return files, links_by_page
+
+    @staticmethod
+    def _resolve_internal(page, link, files):
+        """
+        :return: True if the link target exists in the site
+        """
+        path = unquote(urlsplit(link).path)
+        if not path:
+            return True  # same page, fragment only
+        if path.startswith('/'):
+            target = posixpath.normpath(path.lstrip('/')) if path != '/' else ''
+        else:
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+        if target in ('', '.'):
+            target = 'index.html'
+        if target.startswith('..'):
+            return False
+        return target in files or f"{target}/index.html" in files
+
+    def _host_limit(self, url):
+        with self._host_limits_lock:
+            return self._host_limits[urlsplit(url).netloc]
+
+    def _check_external(self, url):
+        """
+        :return: (url, result dict with ok, status, error)
+        """
+        with self._host_limit(url):
+            try:
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+                if response.status_code in (403, 405, 501):
+                    # some servers do not support HEAD
+                    response = self.session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                    response.close()
+                result = {"ok": response.status_code < 400, "status": response.status_code, "error": None}
+            except requests.exceptions.RequestException as e:
+                result = {"ok": False, "status": None, "error": type(e).__name__}
+        result["checked_at"] = int(time.time())
+        return url, result
+
+    def validate(self, check_external=True):
+        """
+        :return: report as dict
+        """
+        start_time = time.perf_counter()
+        files, links_by_page = self._read_site()
+
+        internal_count = 0
+        broken_internal = []
+        external_sources = defaultdict(list)
+        for page, links in sorted(links_by_page.items()):
+            for link in links:
+                parts = urlsplit(link)
+                if parts.scheme in IGNORED_SCHEMES:
+                    continue
+                if parts.scheme in ('http', 'https'):
+                    external_sources[link].append(page)
+                elif not parts.scheme and not parts.netloc:
+                    internal_count += 1
+                    if not self._resolve_internal(page, link, files):
+                        broken_internal.append({"source": page, "target": link})
+
+        external_results = {}
+        cached_count = 0
+        if check_external:
+            now = int(time.time())
+            to_check = []
+            for url in external_sources:
+                cached = self.cache.get(url)
+                if cached and cached["ok"] and now - cached["checked_at"] < self.cache_ttl:
+                    external_results[url] = cached
+                    cached_count += 1
+                else:
+                    to_check.append(url)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                external_results.update(executor.map(self._check_external, to_check))
+            self.cache = {url: result for url, result in external_results.items()}
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f)
+
+        broken_external = [
+            {"url": url, "status": result["status"], "error": result["error"], "sources": external_sources[url]}
+            for url, result in sorted(external_results.items()) if not result["ok"]
+        ]
+        duration = time.perf_counter() - start_time
+        logging.info(f"Link validation in {duration:.1f}s: {len(broken_internal)} of {internal_count} internal links broken, "
+                     f"{len(broken_external)} of {len(external_results)} external links broken ({cached_count} cached)")
+        return {
+            "checked_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "site_dir": self.site_dir,
+            "files_count": len(links_by_page),
+            "internal": {"checked": internal_count, "broken": broken_internal},
+            "external": {
+                "checked": len(external_results),
+                "cached": cached_count,
+                "skipped": not check_external,
+                "broken": broken_external,
+            },
+        }
+
+
+def write_report(report, path=os.path.join("releases_data", "link_report.json")):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    report_path = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--report=')),
+                       os.path.join("releases_data", "link_report.json"))
+    report = LinkValidator(args[0] if args else "docs").validate('--no-external' not in sys.argv)
+    write_report(report, report_path)
+    sys.exit(1 if report["internal"]["broken"] or report["external"]["broken"] else 0)
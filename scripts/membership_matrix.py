@@ -0,0 +1,61 @@
+# OAM x (OFM + Device) Membership as Bitsets, for All Overview Tables
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+
+class MembershipMatrix:
+    """
+    One bitset (Python int) per OAM with one bit per column (OFM or device), computed once for all tables.
+
+    Column groups are given as lists of column indices, so the per-OFM and per-device views use
+    subsets of the same matrix without any further lookup in the OAM data.
+    """
+
+    def __init__(self, oam_data, modules, devices):
+        """
+        :param oam_data: dict OAM-name -> details with "modules" (dict) and "devices" (list)
+        :param modules: names of all OFMs used as columns
+        :param devices: names of all devices used as columns
+        """
+        self.oam_names = list(oam_data.keys())
+        self._module_index = {module: index for index, module in enumerate(modules)}
+        self._device_index = {device: len(modules) + index for index, device in enumerate(devices)}
+        self._rows = {}
+        for oam_name, oam_details in oam_data.items():
+            bits = 0
+            for module in oam_details["modules"]:
+                if module in self._module_index:
+                    bits |= 1 << self._module_index[module]
+            for device in oam_details["devices"]:
+                if device in self._device_index:
+                    bits |= 1 << self._device_index[device]
+            self._rows[oam_name] = bits
+
+    def module_columns(self, modules):
+        return [self._module_index[module] for module in modules]
+
+    def device_columns(self, devices):
+        return [self._device_index[device] for device in devices]
+
+    def cells(self, oam_name, columns):
+        """
+        :return: list of bool, membership of the OAM for each column
+        """
+        bits = self._rows[oam_name]
+        return [bool(bits >> column & 1) for column in columns]
+
+    def select(self, oam_name, names, columns):
+        """
+        :return: the names of the columns the OAM is member of, in order of names
+        """
+        bits = self._rows[oam_name]
+        return [name for name, column in zip(names, columns) if bits >> column & 1]
+
+    def oams_with_module(self, module):
+        return self._oams_with(self._module_index[module])
+
+    def oams_with_device(self, device):
+        return self._oams_with(self._device_index[device])
+
+    def _oams_with(self, column):
+        mask = 1 << column
+        return [oam_name for oam_name in self.oam_names if self._rows[oam_name] & mask]
@@ -0,0 +1,182 @@
+# Compact Typed In-Memory Model of Repos, Releases and Modules
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+#
+# All classes use __slots__ (no per-instance dict) and intern the names, which occur in many places.
+# from_json()/to_json() convert losslessly from/to the JSON formats of releases.json, snapshot and data/ofms.json.
+
+import sys
+import zlib
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Repo:
+    """Repo as listed by the GitHub API, reduced to the fields used for processing"""
+
+    FIELDS = ("name", "html_url", "archived", "description", "default_branch", "releases_url", "updated_at", "pushed_at")
+    __slots__ = FIELDS
+
+    def __init__(self, name, html_url=None, archived=None, description=None, default_branch=None, releases_url=None,
+                 updated_at=None, pushed_at=None):
+        self.name = _intern(name)
+        self.html_url = html_url
+        self.archived = archived
+        self.description = description
+        self.default_branch = _intern(default_branch)
+        self.releases_url = releases_url
+        self.updated_at = updated_at
+        self.pushed_at = pushed_at
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+    def to_json(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class Asset:
+    """Release archive (zip) of a release"""
+
+    FIELDS = ("name", "size", "digest", "updated_at", "browser_download_url")
+    __slots__ = FIELDS
+
+    def __init__(self, name, size=None, digest=None, updated_at=None, browser_download_url=None):
+        self.name = _intern(name)
+        self.size = size
+        self.digest = digest
+        self.updated_at = updated_at
+        self.browser_download_url = browser_download_url
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+    def to_json(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class Release:
+    """
+    Release of an OAM. The body (Markdown) is needed only for the release pages,
+    so it is kept compressed and decoded on access only.
+    """
+
+    FIELDS = ("prerelease", "tag_name", "name", "published_at", "html_url", "body", "assets")
+    __slots__ = ("prerelease", "tag_name", "name", "published_at", "html_url", "_body", "assets")
+
+    def __init__(self, prerelease, tag_name, name=None, published_at=None, html_url=None, body=None, assets=()):
+        self.prerelease = prerelease
+        self.tag_name = _intern(tag_name)
+        self.name = name
+        self.published_at = published_at
+        self.html_url = html_url
+        self._body = zlib.compress(body.encode('utf-8')) if body is not None else None
+        self.assets = list(assets)
+
+    @property
+    def body(self):
+        return zlib.decompress(self._body).decode('utf-8') if self._body is not None else None
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get("prerelease"), data.get("tag_name"), data.get("name"), data.get("published_at"),
+                   data.get("html_url"), data.get("body"), [Asset.from_json(asset) for asset in data.get("assets", [])])
+
+    def to_json(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["assets"] = [asset.to_json() for asset in self.assets]
+        return data
+
+
+class OamRecord:
+    """
+    Release data of an OAM, as in releases.json.
+    The newest release and pre-release are determined once on creation.
+    """
+
+    __slots__ = ("repo_url", "archived", "description", "releases", "hw_avail_open", "latest_release", "latest_prerelease")
+
+    def __init__(self, repo_url, archived, description, releases, hw_avail_open=None):
+        self.repo_url = repo_url
+        self.archived = archived
+        self.description = description
+        self.releases = list(releases)
+        self.hw_avail_open = hw_avail_open  # known after analysis of the release archives
+
+        self.latest_release = None
+        self.latest_prerelease = None
+        for release in self.releases:
+            if not release.prerelease:
+                if self.latest_release is None or release.published_at > self.latest_release.published_at:
+                    self.latest_release = release
+            else:
+                if self.latest_prerelease is None or release.published_at > self.latest_prerelease.published_at:
+                    self.latest_prerelease = release
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get("repo_url"), data.get("archived"), data.get("description"),
+                   [Release.from_json(release) for release in data.get("releases") or []], data.get("hw_avail_open"))
+
+    def to_json(self):
+        data = {
+            "repo_url": self.repo_url,
+            "archived": self.archived,
+            "description": self.description,
+            "releases": [release.to_json() for release in self.releases],
+        }
+        if self.hw_avail_open is not None:
+            data["hw_avail_open"] = self.hw_avail_open
+        return data
+
+
+def releases_from_json(releases_data):
+    """
+    :param releases_data: dict OAM-name -> release data as in releases.json
+    :return: dict OAM-name -> OamRecord
+    """
+    return {_intern(oam): OamRecord.from_json(oam_data) for oam, oam_data in releases_data.items()}
+
+
+def releases_to_json(releases_data):
+    return {oam: record.to_json() for oam, record in releases_data.items()}
+
+
+class OfmRecord:
+    """
+    Module (OFM) as defined in data/ofms.json, with icon_url added on loading.
+    Fields not set in the definition stay unset (AttributeError on access, undefined in templates),
+    fields without own slot (e.g. comments) are kept in extra.
+    """
+
+    FIELDS = ("name", "title", "description", "type", "prefix", "icon", "icon_url", "ref_oam", "parent_oam",
+              "dependencies")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, **fields):
+        self.extra = {}
+        for field, value in fields.items():
+            if field in self.FIELDS:
+                setattr(self, field, _intern(value))
+            else:
+                self.extra[field] = value
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(**data)
+
+    def to_json(self):
+        data = {field: getattr(self, field) for field in self.FIELDS if hasattr(self, field)}
+        data.update(self.extra)
+        return data
+
+
+def ofm_data_from_json(ofm_data):
+    return {_intern(name): OfmRecord.from_json(ofm) for name, ofm in ofm_data.items()}
+
+
+def ofm_data_to_json(ofm_data):
+    return {name: ofm.to_json() for name, ofm in ofm_data.items()}
@@ -0,0 +1,152 @@
+# Version-Drift of the OFMs Pinned by the OAMs, Compared to the Head of the OFM Default-Branch
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from rate_limit import RateLimitExhausted, WorkItem
+
+# status of the compare API is seen from the head, drift is seen from the pin
+PIN_STATUS = {"identical": "identical", "ahead": "behind", "behind": "ahead", "diverged": "diverged"}
+
+
+def build_pin_index(all_oam_dependencies):
+    """
+    :param all_oam_dependencies: dict OAM-name -> dependencies as from DependencyManager.fetch_dependencies()
+    :return: dict OFM-name -> dict OAM-name -> (pinned commit, branch)
+    """
+    index = {}
+    for oam, dependencies in all_oam_dependencies.items():
+        for dep_name, dependency in dependencies.items():
+            index.setdefault(dep_name, {})[oam] = (dependency["commit"], dependency["branch"])
+    return dict(sorted(index.items()))
+
+
+class OfmDrift:
+    """
+    For each pin of an OFM by an OAM: number of commits the pin is behind (and ahead of) the head of the OFM default-branch.
+
+    The comparison of two commits never changes, so the results are cached by commit pair, as long as the pair is in use.
+    Each distinct pair is compared only once, independent of the number of OAMs using it.
+    The head of an OFM is read again only when the repo was pushed since the last run (push time from RepoList),
+    so API calls are needed only when a pin or a head moves. All calls are planned within the API budget,
+    deferred heads and comparisons are done in a later run.
+    """
+
+    def __init__(self, client, repo_list=None, cache_path=os.path.join("releases_data", "ofm_drift.json"), max_workers=8):
+        self.client = client
+        self.repo_list = repo_list
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.heads = {}  # OFM-name -> {"pushed_at", "head"}
+        self.compares = {}  # "OFM-name:pin...head" -> compare result
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            self.heads = cache["heads"]
+            self.compares = cache["compares"]
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(f"{self.cache_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({"heads": self.heads, "compares": self.compares}, f)
+        os.replace(f"{self.cache_path}.tmp", self.cache_path)
+
+    def _read_heads(self, ofm_names):
+        pushed = {repo["name"]: repo.get("pushed_at") for repo in self.repo_list.cached_repos()} if self.repo_list else {}
+        to_read = [
+            name for name in ofm_names
+            if name not in self.heads or pushed.get(name) is None or pushed[name] != self.heads[name]["pushed_at"]
+        ]
+        # OFMs without known head first
+        scheduled, deferred = self.client.budget.plan([WorkItem((name in self.heads, name), 1, name) for name in to_read])
+        logging.info(f"OFM-Drift: read head of {len(scheduled)} of {len(ofm_names)} OFMs ({len(deferred)} deferred)")
+
+        def read_head(name):
+            try:
+                # HEAD resolves to the default branch
+                return name, self.client.get_branch_head_sha(name, "HEAD")
+            except RateLimitExhausted:
+                return name, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for name, head in executor.map(read_head, [item.payload for item in scheduled]):
+                if head is not None or name not in self.heads:
+                    self.heads[name] = {"pushed_at": pushed.get(name) if head is not None else None, "head": head}
+
+    def _compare(self, ofm, pin, head):
+        url = f"{self.client.base_url}/repos/{self.client.org_name}/{ofm}/compare/{pin}...{head}?per_page=1"
+        response = self.client.get_response(url, True)
+        if response is None:
+            # pinned commit not (longer) in the repo
+            return {"status": "unknown", "behind_by": None, "ahead_by": None}
+        data = response.json()
+        # base is the pin: commits only in head are missing in the pin
+        return {
+            "status": PIN_STATUS.get(data["status"], data["status"]),
+            "behind_by": data["ahead_by"],
+            "ahead_by": data["behind_by"],
+        }
+
+    def _compare_all(self, pairs):
+        missing = sorted(key for key in pairs if key not in self.compares)
+        scheduled, deferred = self.client.budget.plan([WorkItem(key, 1, key) for key in missing])
+        logging.info(f"OFM-Drift: compare {len(scheduled)} of {len(pairs)} commit pairs ({len(deferred)} deferred)")
+
+        def compare(key):
+            try:
+                return key, self._compare(*pairs[key])
+            except RateLimitExhausted:
+                return key, None  # compared in a later run
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self.compares.update((key, result) for key, result in executor.map(compare, [item.payload for item in scheduled])
+                                 if result is not None)
+
+    def analyse(self, all_oam_dependencies):
+        """
+        :return: dict OFM-name -> {"head", "pins": dict OAM-name -> {"commit", "branch", "status", "behind_by", "ahead_by"}};
+                 status None for pins not compared yet (API budget)
+        """
+        index = build_pin_index(all_oam_dependencies)
+        self._read_heads(list(index.keys()))
+        # keep only OFMs still pinned
+        self.heads = {name: head for name, head in self.heads.items() if name in index}
+
+        pairs = {}
+        for ofm, pins in index.items():
+            head = self.heads.get(ofm, {}).get("head")  # None if not read yet (API budget)
+            for commit, _ in pins.values():
+                if head and commit != head:
+                    pairs[f"{ofm}:{commit}...{head}"] = (ofm, commit, head)
+        # results of moved pins or heads are never used again
+        self.compares = {key: result for key, result in self.compares.items() if key in pairs}
+        self._compare_all(pairs)
+        self._save()
+
+        drift = {}
+        for ofm, pins in index.items():
+            head = self.heads.get(ofm, {}).get("head")
+            drift[ofm] = {"head": head, "pins": {}}
+            for oam, (commit, branch) in sorted(pins.items()):
+                if not head:
+                    result = {"status": "unknown", "behind_by": None, "ahead_by": None}
+                elif commit == head:
+                    result = {"status": "identical", "behind_by": 0, "ahead_by": 0}
+                else:
+                    result = self.compares.get(f"{ofm}:{commit}...{head}", {"status": None, "behind_by": None, "ahead_by": None})
+                drift[ofm]["pins"][oam] = {"commit": commit, "branch": branch, **result}
+        return drift
+
+    @staticmethod
+    def by_oam(drift):
+        """
+        :return: dict OAM-name -> dict OFM-name -> pin, as in analyse()
+        """
+        oams = {}
+        for ofm, ofm_drift in drift.items():
+            for oam, pin in ofm_drift["pins"].items():
+                oams.setdefault(oam, {})[ofm] = pin
+        return dict(sorted(oams.items()))
@@ -1,11 +1,16 @@
 # Central Handling of Filesystem-Paths for OAM-/OFM-/Devices-Info
 # (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
 
+import logging
 import os
 import re
+import shutil
 
 
 class PathManager:
+    # Unterverzeichnisse mit je einem Verzeichnis pro OAM/OFM/Gerät
+    ENTITY_DIRS = ("oam", "ofm", "devices")
+
     def __init__(self, base_dir="docs"):
         """
         Initialisiert den PathManager mit einem Basisverzeichnis.
@@ -13,6 +18,11 @@ class PathManager:
         :param base_dir: Das Basisverzeichnis, in dem alle Dateien und Ordner erstellt werden.
         """
         self.base_dir = base_dir
+        self.live_dir = None  # gesetzt, solange in ein Staging-Verzeichnis geschrieben wird
+        self._existing_dirs = set()
+        self._planned_entities = {}
+        self.reset_planning()
+        self._recover_previous()
 
     def get_base_path(self):
         """
@@ -30,11 +40,157 @@ class PathManager:
         :return: Der vollständige Pfad.
         """
         subdirs = tuple(filter(None, subdirs))
-        os.makedirs(os.path.join(self.base_dir, *subdirs), exist_ok=True)
+        self._make_dir(os.path.join(self.base_dir, *subdirs))
         if filename:
             return os.path.join(self.base_dir, *subdirs, filename)
         return os.path.join(self.base_dir, *subdirs)
 
+    def _make_dir(self, path):
+        # jedes Verzeichnis nur einmal anlegen, statt bei jedem Pfad-Zugriff
+        if path not in self._existing_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._existing_dirs.add(path)
+
+    def reset_planning(self):
+        """
+        Vergisst die geplanten Namen des vorherigen Durchgangs, vor dem Planen eines neuen Builds aufzurufen.
+        Sonst würden Seiten entfernter OAMs/OFMs/Geräte in lang laufenden Prozessen weiter verlinkt und nie entfernt.
+        """
+        self._planned_entities = {entity_dir: set() for entity_dir in self.ENTITY_DIRS}
+
+    def plan_directories(self, entity_dir, names):
+        """
+        Legt alle Verzeichnisse für eine Art von Seiten vorab in einem Durchgang an
+        und merkt sich die Namen für das Entfernen veralteter Seiten beim Veröffentlichen.
+
+        :param entity_dir: "oam", "ofm" oder "devices"
+        :param names: Namen der OAMs/OFMs/Geräte
+        """
+        if entity_dir == "devices":
+            names = [self.to_device_pathname(name) for name in names]
+        self._planned_entities[entity_dir].update(names)
+        for name in names:
+            self._make_dir(os.path.join(self.base_dir, entity_dir, name))
+
+    def keep_entities(self, entity_dir, names):
+        """
+        Übernimmt vorhandene Seiten unverändert, ohne sie in diesem Durchgang neu zu erzeugen,
+        z.B. für Repos, deren Aktualisierung auf den nächsten Lauf verschoben wurde.
+        Sie werden beim Veröffentlichen nicht als veraltet entfernt.
+
+        :param entity_dir: "oam", "ofm" oder "devices"
+        :param names: Namen der OAMs/OFMs/Geräte
+        """
+        if entity_dir == "devices":
+            names = [self.to_device_pathname(name) for name in names]
+        self._planned_entities[entity_dir].update(names)
+
+    def open_output(self, path):
+        """
+        Öffnet eine Datei zum Schreiben.
+        Im Staging wird eine vorhandene Datei zuerst entfernt, da sie per Hardlink noch zum veröffentlichten Stand gehört.
+
+        :param path: Pfad der Datei, wie von create_path() geliefert.
+        :return: Datei-Objekt (Text, UTF-8)
+        """
+        if self.live_dir is not None and os.path.exists(path):
+            os.unlink(path)
+        return open(path, 'w', encoding='utf8')
+
+    def start_staging(self):
+        """
+        Beginnt einen Build in ein Staging-Verzeichnis neben dem Basisverzeichnis.
+        Der aktuelle Stand wird per Hardlinks übernommen, nicht erzeugte Dateien (index.html, css, ...) bleiben so erhalten.
+
+        :return: Der Pfad des Staging-Verzeichnisses.
+        """
+        staging_dir = f"{self.base_dir}.staging"
+        if os.path.exists(staging_dir):
+            logging.warning(f"Remove incomplete staging from previous run: {staging_dir}")
+            shutil.rmtree(staging_dir)
+        if os.path.isdir(self.base_dir):
+            shutil.copytree(self.base_dir, staging_dir, copy_function=os.link)
+        logging.info(f"Staging output in {staging_dir}")
+        self.live_dir = self.base_dir
+        self.base_dir = staging_dir
+        self._existing_dirs = set()
+        self.reset_planning()
+        return staging_dir
+
+    def is_planned(self, entity_dir, name):
+        """
+        :return: True, wenn für den Namen in diesem Durchgang Seiten angelegt werden, siehe plan_directories()
+        """
+        if entity_dir == "devices":
+            name = self.to_device_pathname(name)
+        return name in self._planned_entities[entity_dir]
+
+    def _remove_stale_entities(self):
+        for entity_dir, planned_names in self._planned_entities.items():
+            path = os.path.join(self.base_dir, entity_dir)
+            if not planned_names or not os.path.isdir(path):
+                continue
+            for name in os.listdir(path):
+                if os.path.isdir(os.path.join(path, name)) and name not in planned_names:
+                    logging.info(f"Remove stale pages: {entity_dir}/{name}")
+                    shutil.rmtree(os.path.join(path, name))
+
+    def _sync_to_live(self):
+        # Neue und geänderte Dateien per Umbenennen übernehmen: jede Datei wird atomar ersetzt,
+        # das Basisverzeichnis selbst bleibt immer bestehen (auch bei Abbruch mitten im Veröffentlichen).
+        # Unveränderte Dateien sind Hardlinks auf dieselbe Datei und werden übersprungen.
+        published = set()
+        for staging_root, dirs, files in os.walk(self.base_dir):
+            relative_root = os.path.relpath(staging_root, self.base_dir)
+            live_root = os.path.join(self.live_dir, relative_root)
+            if os.path.isfile(live_root):
+                os.unlink(live_root)
+            os.makedirs(live_root, exist_ok=True)
+            published.add(os.path.normpath(relative_root))
+            for filename in files:
+                staging_path = os.path.join(staging_root, filename)
+                live_path = os.path.join(live_root, filename)
+                if os.path.isdir(live_path):
+                    shutil.rmtree(live_path)
+                if not (os.path.exists(live_path) and os.path.samefile(staging_path, live_path)):
+                    os.replace(staging_path, live_path)
+                published.add(os.path.normpath(os.path.join(relative_root, filename)))
+        # danach alles entfernen, was im Staging nicht mehr vorhanden ist
+        for live_root, dirs, files in os.walk(self.live_dir, topdown=False):
+            relative_root = os.path.relpath(live_root, self.live_dir)
+            for name in files:
+                if os.path.normpath(os.path.join(relative_root, name)) not in published:
+                    os.unlink(os.path.join(live_root, name))
+            for name in dirs:
+                if os.path.normpath(os.path.join(relative_root, name)) not in published:
+                    shutil.rmtree(os.path.join(live_root, name))
+
+    def publish(self):
+        """
+        Veröffentlicht das Staging-Verzeichnis durch Abgleich mit dem Basisverzeichnis (Hardlink-Sync).
+        Seiten von nicht mehr vorhandenen OAMs/OFMs/Geräten werden dabei entfernt.
+        """
+        if self.live_dir is None:
+            return
+        self._remove_stale_entities()
+        self._sync_to_live()
+        shutil.rmtree(self.base_dir)
+        logging.info(f"Published {self.base_dir} to {self.live_dir}")
+        self.base_dir = self.live_dir
+        self.live_dir = None
+        self._existing_dirs = set()
+
+    def _recover_previous(self):
+        # Überbleibsel des früheren Veröffentlichens per Verzeichnis-Tausch (Abbruch zwischen den beiden Umbenennungen)
+        previous_dir = f"{self.base_dir}.previous"
+        if not os.path.exists(previous_dir):
+            return
+        if os.path.exists(self.base_dir):
+            shutil.rmtree(previous_dir)
+        else:
+            logging.warning(f"Restore {self.base_dir} from interrupted publish: {previous_dir}")
+            os.rename(previous_dir, self.base_dir)
+
     def get_oam_path(self, oam_name, filename=""):
         """
         Gibt den Pfad für ein spezifisches OAM zurück.
@@ -70,9 +226,7 @@ class PathManager:
         :param subdirs: Beliebige Anzahl von Unterverzeichnissen.
         :return: Der vollständige Pfad des erstellten Verzeichnisses.
         """
-        path = self.create_path(*subdirs)
-        os.makedirs(path, exist_ok=True)
-        return path
+        return self.create_path(*subdirs)
 
     @staticmethod
     def to_device_pathname(device_name):
@@ -0,0 +1,276 @@
+# Local Read-Only HTTP Service Answering Queries on Releases, Devices and AppIDs from the Latest Snapshot
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+#
+# Usage: python scripts/query_service.py [--port=8080] [--host=127.0.0.1] [--snapshot=releases_data/snapshot.json.gz]
+#                                        [--appids=docs/appid2repo.json] [--reload-interval=5]
+#
+# GET /status                  time of snapshot and loading, number of entries
+# GET /oams                    all OAMs with tag of the latest release
+# GET /oams/<oam>              details of an OAM: latest release and pre-release, devices, modules
+# GET /oams/<oam>/latest       latest release of an OAM
+# GET /devices                 all devices with the number of supporting OAMs
+# GET /devices/<device>        OAMs supporting a device (name URL-encoded)
+# GET /appids/<appid>          OAMs and apps using an AppID, e.g. 0xA011 or A011
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from model import OamRecord
+from snapshot import DEFAULT_SNAPSHOT_PATH, load_snapshot
+
+DEFAULT_APPIDS_PATH = os.path.join("docs", "appid2repo.json")
+# smaller responses are sent uncompressed
+GZIP_MIN_SIZE = 512
+
+
+def _release_summary(release):
+    if release is None:
+        return None
+    return {
+        "tag_name": release.tag_name,
+        "name": release.name,
+        "prerelease": release.prerelease,
+        "published_at": release.published_at,
+        "html_url": release.html_url,
+        "assets": [{"name": asset.name, "size": asset.size, "browser_download_url": asset.browser_download_url}
+                   for asset in release.assets],
+    }
+
+
+def normalize_appid(appid):
+    """
+    :return: AppID in the format of appid2repo.json, e.g. '0xA011'; None if not a hex number
+    """
+    value = appid[2:] if appid.lower().startswith("0x") else appid
+    try:
+        return f"0x{int(value, 16):04X}"
+    except ValueError:
+        return None
+
+
+class QueryIndex:
+    """
+    In-memory indexes of one snapshot, read-only after creation.
+    Encoded responses are cached per path, as the data never changes for an index.
+    """
+
+    def __init__(self, snapshot, appids):
+        """
+        :param snapshot: as from load_snapshot()
+        :param appids: "data" of appid2repo.json, AppID -> "OAM / App" or list of them
+        """
+        self.created_at = snapshot["created_at"]
+        self.loaded_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.oams = {name: OamRecord.from_json(data) for name, data in snapshot["releases"].items()}
+        self.oam_devices = snapshot.get("hardware", {})
+        self.oam_modules = {oam: sorted(dependencies) for oam, dependencies in snapshot.get("dependencies", {}).items()}
+
+        self.device_oams = {}
+        for oam, devices in self.oam_devices.items():
+            for device in devices:
+                self.device_oams.setdefault(device, []).append(oam)
+        self.device_oams = dict(sorted(self.device_oams.items()))
+
+        self.appids = {}
+        for appid, entries in appids.items():
+            entries = entries if isinstance(entries, list) else [entries]
+            self.appids[normalize_appid(appid) or appid] = [
+                dict(zip(("oam", "app"), (part.strip() for part in entry.split("/", 1)))) for entry in entries
+            ]
+        self._responses = {}
+
+    def query(self, path):
+        """
+        :return: (status, data) for a request path
+        """
+        parts = [unquote(part) for part in urlsplit(path).path.strip("/").split("/") if part]
+        if parts == ["status"]:
+            return 200, {
+                "snapshot_created_at": self.created_at,
+                "loaded_at": self.loaded_at,
+                "oams": len(self.oams),
+                "devices": len(self.device_oams),
+                "appids": len(self.appids),
+            }
+        if parts == ["oams"]:
+            return 200, {oam: record.latest_release.tag_name if record.latest_release else None
+                         for oam, record in self.oams.items()}
+        if len(parts) in (2, 3) and parts[0] == "oams":
+            record = self.oams.get(parts[1])
+            if record is None:
+                return 404, {"error": f"Unknown OAM '{parts[1]}'"}
+            if len(parts) == 3:
+                if parts[2] != "latest":
+                    return 404, {"error": f"Unknown query '{parts[2]}'"}
+                if record.latest_release is None:
+                    return 404, {"error": f"No release of '{parts[1]}'"}
+                return 200, _release_summary(record.latest_release)
+            return 200, {
+                "name": parts[1],
+                "description": record.description,
+                "repo_url": record.repo_url,
+                "archived": record.archived,
+                "latest_release": _release_summary(record.latest_release),
+                "latest_prerelease": _release_summary(record.latest_prerelease),
+                "devices": self.oam_devices.get(parts[1], []),
+                "modules": self.oam_modules.get(parts[1], []),
+            }
+        if parts == ["devices"]:
+            return 200, {device: len(oams) for device, oams in self.device_oams.items()}
+        if len(parts) == 2 and parts[0] == "devices":
+            if parts[1] not in self.device_oams:
+                return 404, {"error": f"Unknown device '{parts[1]}'"}
+            return 200, {"device": parts[1], "oams": self.device_oams[parts[1]]}
+        if len(parts) == 2 and parts[0] == "appids":
+            appid = normalize_appid(parts[1])
+            if appid not in self.appids:
+                return 404, {"error": f"Unknown AppID '{parts[1]}'"}
+            return 200, {"appid": appid, "apps": self.appids[appid]}
+        return 404, {"error": f"Unknown path '{path}'"}
+
+    def response(self, path):
+        """
+        :return: (status, body, gzip-compressed body or None, ETag)
+        """
+        cached = self._responses.get(path)
+        if cached is None:
+            status, data = self.query(path)
+            body = json.dumps(data, ensure_ascii=False, indent=1).encode('utf-8')
+            compressed = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+            etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+            cached = (status, body, compressed, etag)
+            if len(self._responses) < 10000:  # limit for arbitrary paths of unknown entries
+                self._responses[path] = cached
+        return cached
+
+
+def load_index(snapshot_path=DEFAULT_SNAPSHOT_PATH, appids_path=DEFAULT_APPIDS_PATH):
+    appids = {}
+    if os.path.exists(appids_path):
+        with open(appids_path, 'r', encoding='utf-8') as f:
+            appids = json.load(f)["data"]
+    else:
+        logging.warning(f"No AppIDs available, {appids_path} not found")
+    index = QueryIndex(load_snapshot(snapshot_path), appids)
+    logging.info(f"Loaded snapshot created at {index.created_at}: {len(index.oams)} OAMs, "
+                 f"{len(index.device_oams)} devices, {len(index.appids)} AppIDs")
+    return index
+
+
+class QueryService:
+    """
+    Holds the index of the latest snapshot and replaces it when a new snapshot (or AppID list) is published.
+    Snapshots are written by replacing the file, so a new file is always complete.
+    """
+
+    def __init__(self, snapshot_path=DEFAULT_SNAPSHOT_PATH, appids_path=DEFAULT_APPIDS_PATH, reload_interval=5):
+        self.snapshot_path = snapshot_path
+        self.appids_path = appids_path
+        self.reload_interval = reload_interval
+        self._stop = threading.Event()
+        self._files_state = self._read_files_state()
+        self.index = load_index(snapshot_path, appids_path)
+
+    def _read_files_state(self):
+        return tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else None
+                     for path in (self.snapshot_path, self.appids_path))
+
+    def reload_if_changed(self):
+        """
+        :return: True if a new index was loaded
+        """
+        files_state = self._read_files_state()
+        if files_state == self._files_state:
+            return False
+        try:
+            index = load_index(self.snapshot_path, self.appids_path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Keep previous snapshot, loading failed: {e}")
+            return False
+        self._files_state = files_state
+        self.index = index  # atomic swap, running requests keep the previous index
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval):
+            self.reload_if_changed()
+
+    def start_watching(self):
+        threading.Thread(target=self._watch, name="snapshot-watcher", daemon=True).start()
+
+    def stop_watching(self):
+        self._stop.set()
+
+
+def _matches_etag(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def create_handler(service):
+
+    class QueryHandler(BaseHTTPRequestHandler):
+
+        def _respond(self, with_body):
+            status, body, compressed, etag = service.index.response(self.path)
+            if _matches_etag(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            use_gzip = compressed is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+            content = compressed if use_gzip else body
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            if with_body:
+                self.wfile.write(content)
+
+        def do_GET(self):
+            self._respond(True)
+
+        def do_HEAD(self):
+            self._respond(False)
+
+        def log_message(self, format, *args):
+            logging.debug(f"{self.address_string()} {format % args}")
+
+    return QueryHandler
+
+
+def serve(host="127.0.0.1", port=8080, snapshot_path=DEFAULT_SNAPSHOT_PATH, appids_path=DEFAULT_APPIDS_PATH,
+          reload_interval=5):
+    service = QueryService(snapshot_path, appids_path, reload_interval)
+    service.start_watching()
+    server = ThreadingHTTPServer((host, port), create_handler(service))
+    logging.info(f"Query service on http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop_watching()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    serve(options.get("host", "127.0.0.1"), int(options.get("port", 8080)),
+          options.get("snapshot", DEFAULT_SNAPSHOT_PATH), options.get("appids", DEFAULT_APPIDS_PATH),
+          float(options.get("reload-interval", 5)))
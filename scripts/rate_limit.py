@@ -0,0 +1,81 @@
+# Track the GitHub API Rate Limit and Plan Work within the Remaining Budget
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import logging
+import time
+from typing import Any, NamedTuple
+
+
+class RateLimitExhausted(Exception):
+    """Rate limit reached and its reset too far away to wait for, remaining work has to be deferred to the next run"""
+
+
+class WorkItem(NamedTuple):
+    """Unit of work with estimated number of API calls; lower priority value is more important"""
+    priority: Any
+    cost: int
+    payload: Any
+
+
+class RateLimitBudget:
+    """
+    Remaining API calls as reported by the X-RateLimit-* headers of the last response.
+    Only the 'core' resource is tracked, downloads from raw.githubusercontent.com or release assets have no such headers.
+    """
+
+    def __init__(self, reserve=5):
+        """
+        :param reserve: number of calls to keep unused, e.g. for retries
+        """
+        self.reserve = reserve
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+
+    def update(self, headers):
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        self.limit = int(headers.get('X-RateLimit-Limit', 0))
+        self.remaining = int(headers['X-RateLimit-Remaining'])
+        self.reset = int(headers.get('X-RateLimit-Reset', 0))
+
+    def is_known(self):
+        return self.remaining is not None
+
+    def seconds_to_reset(self):
+        return max(0, self.reset - int(time.time())) if self.reset else 0
+
+    def available(self):
+        """
+        :return: number of calls usable for planned work, None if unknown
+        """
+        if not self.is_known():
+            return None
+        return max(0, self.remaining - self.reserve)
+
+    def plan(self, items):
+        """
+        Select the most important work items that fit into the remaining budget.
+
+        :param items: list of WorkItem
+        :return: (items to do now ordered by priority, deferred items)
+        """
+        available = self.available()
+        needed = sum(item.cost for item in items)
+        scheduled = []
+        deferred = []
+        planned_cost = 0
+        for item in sorted(items, key=lambda i: i.priority):
+            if available is None or planned_cost + item.cost <= available:
+                scheduled.append(item)
+                planned_cost += item.cost
+            else:
+                deferred.append(item)
+        if deferred:
+            logging.warning(f"API budget: {self.remaining} of {self.limit} calls left (reset in {self.seconds_to_reset()}s), "
+                            f"plan needs {needed} => defer {len(deferred)} of {len(items)} items to next run")
+        else:
+            logging.info(f"API budget: {self.remaining} of {self.limit} calls left, plan needs {needed}")
+        return scheduled, deferred
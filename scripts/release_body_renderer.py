@@ -0,0 +1,87 @@
+# Convert Markdown of Release-Descriptions to HTML, Cached by Content-Hash
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+
+import markdown
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+# part of the cache key: entries created by other versions of the conversion are not used
+RENDERER_VERSION = "safe-1"
+SAFE_URL_SCHEMES = {"", "http", "https", "mailto"}
+
+
+class _SafeUrlTreeprocessor(Treeprocessor):
+    """Remove links and image sources with schemes like javascript: or data:"""
+
+    def run(self, root):
+        for element in root.iter():
+            for attribute in ("href", "src"):
+                value = element.get(attribute)
+                if value is None:
+                    continue
+                # browsers ignore entities, whitespace and control characters within the scheme
+                scheme = urlsplit(re.sub(r'[\x00-\x20]', '', html.unescape(value))).scheme.lower()
+                if scheme not in SAFE_URL_SCHEMES:
+                    logging.warning(f"Remove unsafe {attribute} from release body: {value}")
+                    del element.attrib[attribute]
+
+
+class _SafeHtmlExtension(Extension):
+    """
+    Release bodies are published on the pages without any review, so raw HTML is not passed through,
+    but escaped and shown as text (e.g. <script>, <iframe>, onerror=...). Only HTML generated by Markdown remains.
+    """
+
+    def extendMarkdown(self, md):
+        md.preprocessors.deregister('html_block')
+        md.inlinePatterns.deregister('html')
+        md.treeprocessors.register(_SafeUrlTreeprocessor(md), 'safe_urls', 0)
+
+
+class ReleaseBodyRenderer:
+    """
+    Release bodies rarely change after publishing, so each body is converted only once.
+    The cache maps the SHA-256 of the Markdown source to the generated HTML.
+    The HTML contains no raw HTML of the source, so it is safe to insert it unescaped into the pages.
+    """
+
+    def __init__(self, cache_path=os.path.join("releases_data", "release_bodies.json")):
+        self.cache_path = cache_path
+        self.cache = {}
+        self.used_keys = set()
+        self.converted_count = 0
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        self.md = markdown.Markdown(extensions=['tables', 'fenced_code', 'sane_lists', _SafeHtmlExtension()])
+        self._lock = threading.Lock()  # Markdown instance is not thread-safe
+
+    def to_html(self, body):
+        if not body:
+            return ""
+        key = f"{RENDERER_VERSION}:{hashlib.sha256(body.encode('utf-8')).hexdigest()}"
+        with self._lock:
+            self.used_keys.add(key)
+            if key not in self.cache:
+                self.cache[key] = self.md.reset().convert(body)
+                self.converted_count += 1
+            return self.cache[key]
+
+    def save(self):
+        """
+        Write the cache, without entries not used in this run (e.g. edited or deleted releases).
+        """
+        logging.info(f"Converted {self.converted_count} of {len(self.used_keys)} release bodies to HTML")
+        cache = {key: html for key, html in self.cache.items() if key in self.used_keys}
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
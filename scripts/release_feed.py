@@ -0,0 +1,150 @@
+# Append-Only Feed of New OAM-Releases as JSON Feed and Atom
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+import logging
+import os
+import xml.etree.ElementTree as ElementTree  # only for writing, no parsing of foreign data
+
+SITE_URL = "https://openknx.github.io"
+FEED_TITLE = "OpenKNX Releases"
+
+
+def release_event_id(oam, tag):
+    """
+    :return: stable id of the release event, independent of feed position or url changes
+    """
+    return f"tag:openknx.github.io,2025:release/{oam}/{tag}"
+
+
+class ReleaseFeed:
+    """
+    Feed of release events (OAM, tag, prerelease-flag, published_at, asset digests), newest first.
+
+    Each run only checks the releases newer than the oldest entry of the previous feed (the watermark),
+    known events are kept unchanged, except for changed prerelease-flag or assets (date_modified is set).
+    The feed is capped to max_entries, so clients can poll a file of some KB instead of releases.json.
+    """
+
+    JSON_FILENAME = "feed.json"
+    ATOM_FILENAME = "feed.atom"
+
+    def __init__(self, path_manager, max_entries=50):
+        self.path_manager = path_manager
+        self.max_entries = max_entries
+
+    def _load_previous_items(self):
+        feed_path = os.path.join(self.path_manager.get_base_path(), self.JSON_FILENAME)
+        if not os.path.exists(feed_path):
+            return []
+        with open(feed_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("items", [])
+
+    @staticmethod
+    def _create_item(oam, release):
+        tag = release.tag_name
+        prerelease = bool(release.prerelease)
+        return {
+            "id": release_event_id(oam, tag),
+            "url": release.html_url,
+            "title": f"{oam} {tag}" + (" (Pre-Release)" if prerelease else ""),
+            "content_text": release.name or tag,
+            "date_published": release.published_at,
+            "tags": [oam, "prerelease" if prerelease else "release"],
+            "attachments": [
+                {
+                    "url": asset.browser_download_url,
+                    "mime_type": "application/zip",
+                    "title": asset.name,
+                    "size_in_bytes": asset.size,
+                }
+                for asset in release.assets
+            ],
+            "_openknx": {
+                "oam": oam,
+                "tag": tag,
+                "prerelease": prerelease,
+                "published_at": release.published_at,
+                "digests": [asset.digest for asset in release.assets],
+            },
+        }
+
+    def update(self, oam_releases_data):
+        """
+        Add the events of new releases and write feed.json and feed.atom.
+
+        :param oam_releases_data: dict OAM-name -> OamRecord
+
+        :return: number of new events
+        """
+        previous_items = self._load_previous_items()
+        items_by_id = {item["id"]: item for item in previous_items}
+        # releases older than the oldest entry are history: already dropped from a full feed, or never part of it
+        watermark = min((item["date_published"] for item in previous_items), default="") \
+            if len(previous_items) >= self.max_entries else ""
+
+        new_count = 0
+        for oam, oam_data in oam_releases_data.items():
+            for release in oam_data.releases:
+                if not release.published_at or release.published_at < watermark:
+                    continue
+                item = self._create_item(oam, release)
+                known_item = items_by_id.get(item["id"])
+                if known_item is None:
+                    items_by_id[item["id"]] = item
+                    new_count += 1
+                elif known_item["_openknx"] != item["_openknx"]:
+                    item["date_modified"] = max([item["date_published"]] + [
+                        asset.updated_at for asset in release.assets if asset.updated_at])
+                    items_by_id[item["id"]] = item
+
+        items = sorted(items_by_id.values(), key=lambda i: (i["date_published"], i["id"]), reverse=True)
+        items = items[:self.max_entries]
+        self._write_json_feed(items)
+        self._write_atom_feed(items)
+        logging.info(f"Release feed with {len(items)} entries, {new_count} new")
+        return new_count
+
+    def _write_json_feed(self, items):
+        feed = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": FEED_TITLE,
+            "home_page_url": f"{SITE_URL}/releases_list.html",
+            "feed_url": f"{SITE_URL}/{self.JSON_FILENAME}",
+            "items": items,
+        }
+        with self.path_manager.open_output(self.path_manager.create_path(filename=self.JSON_FILENAME)) as f:
+            json.dump(feed, f, indent=2, ensure_ascii=False)
+
+    def _write_atom_feed(self, items):
+        atom_ns = "http://www.w3.org/2005/Atom"
+        feed = ElementTree.Element("feed", xmlns=atom_ns)
+        ElementTree.SubElement(feed, "id").text = f"{SITE_URL}/{self.ATOM_FILENAME}"
+        ElementTree.SubElement(feed, "title").text = FEED_TITLE
+        # newest event instead of current time, so unchanged feeds are written unchanged
+        ElementTree.SubElement(feed, "updated").text = max(
+            (item.get("date_modified", item["date_published"]) for item in items), default="1970-01-01T00:00:00Z")
+        ElementTree.SubElement(feed, "link", href=f"{SITE_URL}/{self.ATOM_FILENAME}", rel="self")
+        ElementTree.SubElement(feed, "link", href=f"{SITE_URL}/releases_list.html")
+        for item in items:
+            entry = ElementTree.SubElement(feed, "entry")
+            ElementTree.SubElement(entry, "id").text = item["id"]
+            ElementTree.SubElement(entry, "title").text = item["title"]
+            ElementTree.SubElement(entry, "published").text = item["date_published"]
+            ElementTree.SubElement(entry, "updated").text = item.get("date_modified", item["date_published"])
+            ElementTree.SubElement(ElementTree.SubElement(entry, "author"), "name").text = item["_openknx"]["oam"]
+            if item.get("url"):
+                ElementTree.SubElement(entry, "link", href=item["url"])
+            for attachment in item["attachments"]:
+                ElementTree.SubElement(entry, "link", rel="enclosure", href=attachment["url"],
+                                       type=attachment["mime_type"], length=str(attachment["size_in_bytes"]),
+                                       title=attachment["title"])
+            for tag in item["tags"]:
+                ElementTree.SubElement(entry, "category", term=tag)
+            ElementTree.SubElement(entry, "summary").text = item["content_text"]
+        ElementTree.indent(feed)
+        with self.path_manager.open_output(self.path_manager.create_path(filename=self.ATOM_FILENAME)) as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            f.write(ElementTree.tostring(feed, encoding="unicode"))
+            f.write('\n')
+
@@ -3,63 +3,96 @@
 
 import logging
 
+from model import Asset, OamRecord, Release, Repo
+
 
 class ReleaseManager:
-    def __init__(self, client, app_prefix, app_special_names, app_exclusion):
+    def __init__(self, client, app_prefix, app_special_names, app_exclusion, repo_list=None, journal=None):
+        """
+        :param repo_list: RepoList for incremental listing of the org repos, None for complete listing on each call
+        :param journal: RunJournal to skip repos already fetched by an interrupted run
+        """
         self.client = client
+        self.repo_list = repo_list
+        self.journal = journal
         self.app_prefix = app_prefix
         self.app_special_names = app_special_names
         self.app_exclusion = app_exclusion
 
-    def _check_include_repo(self, repo):
-        rn = repo["name"]
+    def is_app_repo_name(self, rn):
         return (rn.startswith(self.app_prefix) or rn in self.app_special_names) and rn not in self.app_exclusion
 
-    def fetch_app_repos(self):
+    def _check_include_repo(self, repo):
+        return self.is_app_repo_name(repo["name"])
+
+    def fetch_app_repos(self, force_full_refresh=False):
         """
-        Read the info for all public Application Repos (selected by Name) from API and return full data as List.
+        Read the info for all public Application Repos (selected by Name) from API.
 
-        :return: list of structured repo data
+        :return: list of Repo
         """
-        repos_data = self.client.get_org_repos()
+        if self.repo_list is None:
+            repos_data = self.client.get_org_repos()
+        else:
+            repos_data = self.repo_list.get_repos(force_full_refresh)
         app_repos_data = [
-            repo
+            Repo.from_json(repo)
             for repo in repos_data
             if self._check_include_repo(repo)
         ]
         return app_repos_data
 
+    def fetch_app_repo(self, name):
+        """
+        Read the info for a single Application Repo from API.
+
+        :return: Repo, or None if not existing or not an app repo
+        """
+        repo = self.client.get_repo(name)
+        if repo is None or not self._check_include_repo(repo) or repo.get("private"):
+            return None
+        return Repo.from_json(repo)
+
     def fetch_apps_releases(self, repos_data):
         releases_data = {}
         for repo in repos_data:
-            name = repo["name"]
-            url = repo["releases_url"].replace("{/id}", "")
-            logging.info(f"Fetching release data {name} from {url}")
-            releases = self.client.get_json_response(url)
-            releases_data[name] = {
-                "repo_url": repo["html_url"],
-                "archived": repo["archived"],
-                "description": repo["description"],
-                "releases": [
-                    {
-                        "prerelease": release.get("prerelease"),
-                        "tag_name": release.get("tag_name"),
-                        "name": release.get("name"),
-                        "published_at": release.get("published_at"),
-                        "html_url": release.get("html_url"),
-                        "body": release.get("body"),
-                        "assets": [
-                            {
-                                "name": asset.get("name"),
-                                "size": asset.get("size"),
-                                "digest": asset.get("digest"),
-                                "updated_at": asset.get("updated_at"),
-                                "browser_download_url": asset.get("browser_download_url")
-                            }
-                            for asset in release.get("assets") if asset.get("name").endswith(".zip")
-                        ]
-                    }
-                    for release in releases if isinstance(release, dict) and not release.get("draft")
-                ]
-            }
+            releases_data[repo.name] = self.fetch_repo_releases(repo)
         return releases_data
+
+    def fetch_repo_releases(self, repo):
+        """
+        :return: OamRecord with all published releases and their zip-assets
+        """
+        version = f"{repo.pushed_at}|{repo.updated_at}"
+        if self.journal is not None:
+            data = self.journal.get("releases", repo.name, version)
+            if data is not None:
+                logging.info(f"Use release data {repo.name} from journal")
+                return OamRecord.from_json(data)
+
+        url = repo.releases_url.replace("{/id}", "")
+        logging.info(f"Fetching release data {repo.name} from {url}")
+        releases = self.client.get_json_response(url)
+        oam_data = OamRecord(
+            repo.html_url,
+            repo.archived,
+            repo.description,
+            [
+                Release(
+                    release.get("prerelease"),
+                    release.get("tag_name"),
+                    release.get("name"),
+                    release.get("published_at"),
+                    release.get("html_url"),
+                    release.get("body"),
+                    [
+                        Asset.from_json(asset)
+                        for asset in release.get("assets") if asset.get("name").endswith(".zip")
+                    ]
+                )
+                for release in releases if isinstance(release, dict) and not release.get("draft")
+            ]
+        )
+        if self.journal is not None:
+            self.journal.record("releases", repo.name, version, oam_data.to_json())
+        return oam_data
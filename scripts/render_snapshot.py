@@ -0,0 +1,22 @@
+# Render OpenKNX Release Overviews from a Snapshot, without Access to GitHub
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+#
+# Usage: python scripts/render_snapshot.py [snapshot.json.gz] [--staged] [--wait-lock[=seconds]]
+
+import logging
+import sys
+
+from run_journal import RunLock, RunLockBusy
+from snapshot import DEFAULT_SNAPSHOT_PATH, load_snapshot
+from update_releases import render_snapshot
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    # writes docs/ like update_releases.py: not during another run
+    wait_lock = next((arg for arg in sys.argv if arg.startswith('--wait-lock')), None)
+    lock_timeout = 0 if wait_lock is None else (float(wait_lock.split('=', 1)[1]) if '=' in wait_lock else None)
+    try:
+        with RunLock(timeout=lock_timeout):
+            render_snapshot(load_snapshot(args[0] if args else DEFAULT_SNAPSHOT_PATH), '--staged' in sys.argv)
+    except RunLockBusy as e:
+        sys.exit(f"{e} => snapshot not rendered")
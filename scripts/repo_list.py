@@ -0,0 +1,104 @@
+# Locally Stored List of All Org-Repos, Updated Incrementally by Push-Time
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class RepoList:
+    """
+    Full list of all public org repos, refreshed completely only every full_refresh_interval.
+
+    In between only the repos pushed since the last listing are read (sorted by push time, newest first),
+    so the common run without changes costs a single API call. Changes without push (e.g. description,
+    archived-flag, deleted repos) become visible with the next full refresh.
+
+    Changed repos are found by comparing pushed_at/updated_at of the listing with the state of their last
+    processing (see mark_processed()), so a change is reported until processed, independent of its time.
+    """
+
+    def __init__(self, client, path=os.path.join("releases_data", "repos.json"),
+                 full_refresh_interval=timedelta(hours=24)):
+        self.client = client
+        self.path = path
+        self.full_refresh_interval = full_refresh_interval
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, state):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def cached_repos(self):
+        """
+        :return: list of structured repo data as of the last listing, without API call; empty if not available
+        """
+        state = self._load()
+        return state["repos"] if state else []
+
+    def get_repos(self, force_full_refresh=False):
+        """
+        :return: list of structured repo data of all public repos
+        """
+        now = datetime.now(timezone.utc)
+        state = self._load()
+        full_refresh_due = state is None or force_full_refresh or \
+            now - datetime.strptime(state["full_refresh_at"], TIME_FORMAT).replace(tzinfo=timezone.utc) >= self.full_refresh_interval
+
+        if full_refresh_due:
+            repos = self.client.get_org_repos()
+            processed = state.get("processed", {}) if state else {}
+            state = {"full_refresh_at": now.strftime(TIME_FORMAT), "repos": repos, "processed": processed}
+        else:
+            since = state["listed_at"]
+            pushed_repos = self.client.get_org_repos_pushed_since(since)
+            logging.info(f"Repo-list: {len(pushed_repos)} repos pushed since {since}, full refresh at {state['full_refresh_at']}")
+            pushed_by_name = {repo["name"]: repo for repo in pushed_repos}
+            repos = [pushed_by_name.pop(repo["name"], repo) for repo in state["repos"]]
+            repos.extend(pushed_by_name.values())  # new repos
+            state["repos"] = repos
+
+        # time of request start, so pushes during listing are read again next time
+        state["listed_at"] = now.strftime(TIME_FORMAT)
+        self._save(state)
+        return repos
+
+    @staticmethod
+    def _version(repo):
+        return f"{repo.pushed_at}|{repo.updated_at}"
+
+    def changed_repos(self, repos):
+        """
+        :param repos: list of Repo, as from the last get_repos()
+        :return: dict name -> updated_at of the repos pushed or updated since their last processing;
+                 all repos, if none was processed before
+        """
+        state = self._load()
+        processed = state.get("processed", {}) if state else {}
+        return {repo.name: repo.updated_at for repo in repos if processed.get(repo.name) != self._version(repo)}
+
+    def mark_processed(self, repos):
+        """
+        Store the state of repos processed successfully, so they are reported by changed_repos() only on further changes.
+
+        :param repos: list of Repo
+        """
+        state = self._load()
+        if state is None:
+            return
+        listed_names = {repo["name"] for repo in state["repos"]}
+        processed = {name: version for name, version in state.get("processed", {}).items() if name in listed_names}
+        processed.update({repo.name: self._version(repo) for repo in repos})
+        state["processed"] = processed
+        self._save(state)
@@ -0,0 +1,180 @@
+# Journal of Completed Units for Resuming Interrupted Runs, and Lock against Overlapping Runs
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class RunJournal:
+    """
+    Append-only journal (one JSON line per unit) of the units completed in the current run,
+    e.g. the releases or the dependencies of a repo.
+
+    The journal is removed when a run completes. A journal left by an interrupted run
+    (error exit, rate limit, crash) is used by the next run to skip the units already done,
+    as long as the repo did not change in between (version) and the journal is not older than max_age.
+    """
+
+    def __init__(self, path=os.path.join("releases_data", "run_journal.jsonl"), max_age=timedelta(hours=12)):
+        self.path = path
+        self.max_age = max_age
+        self._units = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start a run, resuming the journal of an interrupted run if still valid.
+        """
+        self._units = self._load()
+        if self._units:
+            logging.info(f"Resume interrupted run: {len(self._units)} units completed before")
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({"started_at": datetime.now(timezone.utc).strftime(TIME_FORMAT)})
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        units = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            try:
+                header = json.loads(f.readline())
+                started_at = datetime.strptime(header["started_at"], TIME_FORMAT).replace(tzinfo=timezone.utc)
+            except (ValueError, KeyError):
+                logging.warning(f"Ignore invalid journal {self.path}")
+                return {}
+            if datetime.now(timezone.utc) - started_at > self.max_age:
+                logging.info(f"Ignore outdated journal of run started at {header['started_at']}")
+                return {}
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # last line incomplete on interruption
+                units[(entry["kind"], entry["name"])] = (entry["version"], entry["data"])
+        return units
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self._file.flush()
+
+    def get(self, kind, name, version):
+        """
+        :return: data of the completed unit, None if not completed in this run (or the interrupted one)
+        """
+        unit = self._units.get((kind, name))
+        if unit is None or unit[0] != version:
+            return None
+        return unit[1]
+
+    def record(self, kind, name, version, data):
+        """
+        :param data: result of the unit, as plain JSON data
+        """
+        if self._file is None:
+            return
+        with self._lock:
+            self._units[(kind, name)] = (version, data)
+            self._write({"kind": kind, "name": name, "version": version, "data": data})
+
+    def complete(self):
+        """
+        End the run successfully, nothing to resume.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._units = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RunLockBusy(Exception):
+    pass
+
+
+class RunLock:
+    """
+    Exclusive lock on a file, to serialize runs writing docs/ and releases_data/.
+    The lock is released by the OS when the process ends, also on crash.
+    """
+
+    def __init__(self, path=os.path.join("releases_data", "run.lock"), timeout=0, poll_interval=5):
+        """
+        :param timeout: seconds to wait for a running run, 0 to fail immediately, None to wait without limit
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def _try_lock(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _read_holder(self):
+        try:
+            self._file.seek(0)
+            return self._file.read().strip()
+        except OSError:  # locked region on Windows
+            return None
+
+    def acquire(self):
+        """
+        :raise RunLockBusy: if the lock is held by another run after timeout
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, 'a+', encoding='utf-8')
+        start = time.monotonic()
+        while not self._try_lock():
+            if self.timeout is not None and time.monotonic() - start >= self.timeout:
+                holder = self._read_holder()
+                self._file.close()
+                self._file = None
+                raise RunLockBusy(f"Another run holds {self.path} ({holder or 'unknown'})")
+            time.sleep(self.poll_interval)
+        # for diagnostics only
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(f"pid {os.getpid()} since {datetime.now(timezone.utc).strftime(TIME_FORMAT)}")
+        self._file.flush()
+
+    def release(self):
+        if self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
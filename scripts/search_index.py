@@ -0,0 +1,114 @@
+# Build a Prebuilt Inverted Index for Client-Side Search in OAMs, OFMs and Devices
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import hashlib
+import json
+import logging
+import os
+import re
+
+
+class SearchIndexBuilder:
+    """
+    Collects documents (pages) and writes an inverted index: token -> ids of documents.
+
+    The index is split into shards by the first character of the tokens. Each shard holds the sorted tokens,
+    so the search page can answer prefix queries by binary search after loading a single shard.
+    Shards are plain JSON (compressed in transfer by the web server) and only rewritten if their content changed.
+    """
+
+    FORMAT_VERSION = "v0.1.0"
+
+    def __init__(self):
+        self.documents = []
+        self.postings = {}
+
+    @staticmethod
+    def tokenize(text):
+        """
+        Split text into lower-case tokens. Names are also split at camel-case boundaries,
+        e.g. 'OAM-LogicModule' -> oam, logicmodule, logic, module
+
+        :return: set of tokens
+        """
+        tokens = set()
+        for word in re.findall(r'\w+', text or ""):
+            tokens.add(word.lower())
+            parts = re.findall(r'[A-ZÄÖÜ]?[a-zäöüß]+|[A-ZÄÖÜ]+(?![a-zäöüß])|\d+', word)
+            if len(parts) > 1:
+                tokens.update(part.lower() for part in parts)
+        return tokens
+
+    @staticmethod
+    def shard_key(token):
+        first = token[0]
+        return first if 'a' <= first <= 'z' or '0' <= first <= '9' else '_'
+
+    def add_document(self, url, title, kind, *texts):
+        """
+        :param url: url of the page, relative to the root of the site
+        :param title: title to show in search results
+        :param kind: type of the document, e.g. "oam", "ofm", "device"
+        :param texts: all texts to make searchable, including the title
+        """
+        doc_id = len(self.documents)
+        self.documents.append([url, title, kind])
+        for text in (title,) + texts:
+            for token in self.tokenize(text):
+                doc_ids = self.postings.setdefault(token, [])
+                if not doc_ids or doc_ids[-1] != doc_id:
+                    doc_ids.append(doc_id)
+        return doc_id
+
+    def _build_shards(self):
+        shards = {}
+        for token in sorted(self.postings):
+            shards.setdefault(self.shard_key(token), []).append([token, self.postings[token]])
+        return shards
+
+    @staticmethod
+    def _write_if_changed(path, content):
+        """
+        :return: True if the file was written
+        """
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                if f.read() == content:
+                    return False
+        if os.path.exists(path):
+            os.unlink(path)  # might be hard-linked to published state
+        with open(path, 'wb') as f:
+            f.write(content)
+        return True
+
+    def write(self, out_dir):
+        """
+        Write manifest (documents and list of shards) and all shards to out_dir.
+        Unchanged shards are not rewritten, shards of tokens no longer in use are removed.
+        """
+        shards_meta = {}
+        written = 0
+        for key, entries in self._build_shards().items():
+            data = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            filename = f"shard_{key}.json"
+            if self._write_if_changed(os.path.join(out_dir, filename), data):
+                written += 1
+            # hash for cache busting
+            shards_meta[key] = f"{filename}?v={hashlib.sha256(data).hexdigest()[:12]}"
+
+        for filename in os.listdir(out_dir):
+            # remove unused shards, and all shards of the former gzip-compressed format (.json.gz)
+            match = re.fullmatch(r'shard_(.+)\.json(\.gz)?', filename)
+            if match and (match.group(2) or match.group(1) not in shards_meta):
+                os.unlink(os.path.join(out_dir, filename))
+
+        manifest = {
+            "OpenKnxContentType": "OpenKNX/Search/Index",
+            "OpenKnxFormatVersion": self.FORMAT_VERSION,
+            "documents": self.documents,
+            "shards": shards_meta,
+        }
+        self._write_if_changed(os.path.join(out_dir, "index.json"),
+                               json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        logging.info(f"Search index with {len(self.documents)} documents and {len(self.postings)} tokens, "
+                     f"{written} of {len(shards_meta)} shards changed")
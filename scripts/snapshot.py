@@ -0,0 +1,62 @@
+# Versioned Snapshot of All Data Collected by update_releases.py
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from model import ofm_data_to_json, releases_to_json
+
+SNAPSHOT_CONTENT_TYPE = "OpenKNX/Releases/Snapshot"
+SNAPSHOT_FORMAT_VERSION = "v0.1.0"
+DEFAULT_SNAPSHOT_PATH = os.path.join("releases_data", "snapshot.json.gz")
+
+
+def create_snapshot(repos, releases, hardware_raw, hardware_products, hardware, stats, dependencies, ofm_data):
+    """
+    :param repos: list of Repo
+    :param releases: dict OAM-name -> OamRecord
+    :param ofm_data: dict OFM-name -> OfmRecord
+    :return: snapshot as dict, ready for save_snapshot()
+    """
+    return {
+        "OpenKnxContentType": SNAPSHOT_CONTENT_TYPE,
+        "OpenKnxFormatVersion": SNAPSHOT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "repos": [repo.to_json() for repo in repos],
+        "releases": releases_to_json(releases),
+        "hardware_raw": hardware_raw,
+        "hardware_products": hardware_products,
+        "hardware": hardware,
+        "stats": stats,
+        "dependencies": dependencies,
+        "ofm_data": ofm_data_to_json(ofm_data),
+    }
+
+
+def save_snapshot(snapshot, path=DEFAULT_SNAPSHOT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # write complete file first, readers must never see a partial snapshot
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(gzip.compress(data, mtime=0))
+    os.replace(tmp_path, path)
+    logging.info(f"Saved snapshot to {path} ({len(data)} bytes uncompressed)")
+
+
+def load_snapshot(path=DEFAULT_SNAPSHOT_PATH):
+    """
+    :return: snapshot as dict, with plain JSON data (see model for conversion)
+    :raise ValueError: for files which are no snapshot or in an incompatible format version
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get("OpenKnxContentType") != SNAPSHOT_CONTENT_TYPE:
+        raise ValueError(f"{path} is no snapshot: {snapshot.get('OpenKnxContentType')}")
+    # same major version is compatible
+    if snapshot.get("OpenKnxFormatVersion", "").split('.')[0] != SNAPSHOT_FORMAT_VERSION.split('.')[0]:
+        raise ValueError(f"Unsupported snapshot format {snapshot.get('OpenKnxFormatVersion')} in {path}")
+    return snapshot
@@ -0,0 +1,118 @@
+# Profile the Major Stages of update_releases.py (CPU-Time and Memory)
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import cProfile
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+class StageProfiler:
+    """
+    Per stage the following files are written to out_dir:
+    - <stage>.pstats: cProfile stats of the calling thread, e.g. for `python -m pstats` or snakeviz
+    - <stage>.collapsed: sampled stacks of all threads in collapsed format ("a;b;c <count>"),
+      as input for flamegraph.pl, speedscope or inferno
+    - <stage>.memory.txt: peak of traced memory and top allocation sites
+    """
+
+    def __init__(self, out_dir="profile", sample_interval=0.005, top_allocations=25):
+        self.out_dir = out_dir
+        self.sample_interval = sample_interval
+        self.top_allocations = top_allocations
+        self._active = threading.local()
+
+    def instrument(self, owner, attribute, stage_name=None):
+        """
+        Replace the function owner.<attribute> by a wrapper profiling each call as stage.
+        Works for instance methods and for module functions (with the module as owner).
+        """
+        function = getattr(owner, attribute)
+        stage_name = stage_name or attribute
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.stage(stage_name):
+                return function(*args, **kwargs)
+
+        setattr(owner, attribute, wrapper)
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def _write(self, name, profile, stacks, peak, snapshot, duration):
+        os.makedirs(self.out_dir, exist_ok=True)
+        base_path = os.path.join(self.out_dir, name)
+        profile.dump_stats(f"{base_path}.pstats")
+        with open(f"{base_path}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        with open(f"{base_path}.memory.txt", 'w', encoding='utf-8') as f:
+            f.write(f"stage: {name}\nduration: {duration:.3f}s\npeak: {peak / 1024 / 1024:.1f} MiB\n\n")
+            for stat in snapshot.statistics('lineno')[:self.top_allocations]:
+                f.write(f"{stat}\n")
+        logging.info(f"Profile of stage {name}: {duration:.3f}s, peak {peak / 1024 / 1024:.1f} MiB => {base_path}.*")
+
+
+class _Stage:
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.nested = False
+
+    def __enter__(self):
+        # cProfile can not be enabled twice in one thread, so nested stages count to the outer one
+        self.nested = getattr(self.profiler._active, 'stage', None) is not None
+        if self.nested:
+            return self
+        self.profiler._active.stage = self.name
+
+        self.stacks = Counter()
+        self._stop_sampling = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.start_time = time.perf_counter()
+        self._sampler.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.nested:
+            return False
+        self.profile.disable()
+        duration = time.perf_counter() - self.start_time
+        self._stop_sampling.set()
+        self._sampler.join()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),  # sampled stacks
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        tracemalloc.stop()
+        self.profiler._active.stage = None
+        self.profiler._write(self.name, self.profile, self.stacks, peak, snapshot, duration)
+        return False
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop_sampling.wait(self.profiler.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
@@ -0,0 +1,73 @@
+# Measure the Startup Cost of update_releases.py, as Paid by Each Scheduled Run without Changes
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+#
+# Usage: python scripts/startup_benchmark.py [runs] [--top=15]
+#
+# Each run imports update_releases in a fresh interpreter (cold module state, warm OS file cache).
+# Reports the median import time, the modules of later stages loaded anyway, and the most expensive imports.
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# modules which should be loaded only when their stage runs
+LATE_MODULES = ["jinja2", "markdown", "defusedxml", "html_generator", "release_body_renderer", "devices_helper",
+                "app_sizing_stat", "app_sizing_history", "content_xml", "release_feed"]
+
+MEASURE_CODE = f"""
+import json, sys, time
+sys.path.insert(0, {SCRIPTS_DIR!r})
+start = time.perf_counter()
+import update_releases
+duration = time.perf_counter() - start
+print(json.dumps({{"seconds": duration, "loaded": [m for m in {LATE_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_once():
+    """
+    :return: (import time in seconds, list of late modules loaded by the import)
+    """
+    output = subprocess.run([sys.executable, "-c", MEASURE_CODE], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def import_time_top(top):
+    """
+    :return: list of (cumulative microseconds, module) of the most expensive top-level imports, see python -X importtime
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", MEASURE_CODE],
+                            capture_output=True, text=True, check=True).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        indent = len(name) - len(name.lstrip())
+        if cumulative.strip().isdigit() and indent == 3:
+            # nesting level 1: imported directly by update_releases
+            entries.append((int(cumulative), name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    runs = int(args[0]) if args else 10
+    top = next((int(arg.split('=', 1)[1]) for arg in sys.argv[1:] if arg.startswith('--top=')), 15)
+    os.chdir(os.path.dirname(SCRIPTS_DIR))  # update_releases reads data/ relative to the repo root
+
+    durations = []
+    loaded = []
+    for _ in range(runs):
+        duration, loaded = measure_once()
+        durations.append(duration)
+    print(f"import update_releases: median {statistics.median(durations) * 1000:.1f} ms, "
+          f"min {min(durations) * 1000:.1f} ms, max {max(durations) * 1000:.1f} ms ({runs} runs)")
+    print(f"modules of later stages loaded on import: {', '.join(loaded) if loaded else 'none'}")
+    print("most expensive imports of update_releases:")
+    for cumulative, name in import_time_top(top):
+        print(f"{cumulative / 1000:8.1f} ms  {name}")
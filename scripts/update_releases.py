@@ -1,19 +1,24 @@
 # Build OpenKNX Release Overviews for Integration in Pages, Wiki and Toolbox
 # (C) 2025-2026 Cornelius Köpp; For Usage in OpenKNX-Project only
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 import json
 import logging
 import os
-import defusedxml.ElementTree as ET  # secure replacement for  import xml.etree.ElementTree as ET
-import zipfile
-from io import BytesIO
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from app_sizing_stat import AppSizingStat  # Add this import
+# Modules needed only after changes were detected (Jinja2, Markdown, XML parsing, archive handling, ...)
+# are imported where used, so a run without changes stays cheap.
 from dependency_manager import DependencyManager
-from devices_helper import DeviceHelper
 from github_client import GitHubClient
-from html_generator import HTMLGenerator
+from model import OfmRecord, Repo, ofm_data_from_json, ofm_data_to_json, releases_from_json, releases_to_json
+from path_manager import PathManager
+from rate_limit import RateLimitExhausted, WorkItem
 from release_manager import ReleaseManager
+from repo_list import RepoList
+from run_journal import RunJournal, RunLock, RunLockBusy
+from snapshot import DEFAULT_SNAPSHOT_PATH, create_snapshot, load_snapshot, save_snapshot
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -96,23 +101,110 @@ appOrder = [
     "OAM-BinaryClock",
 ]
 
+# max. number of repos processed in parallel with --pipeline
+PIPELINE_WORKERS = 4
+# estimated API calls per repo: list of releases (dependencies.txt is read from raw.githubusercontent.com)
+API_CALLS_PER_REPO = 1
+REFRESH_STATE_PATH = os.path.join("releases_data", "refresh_state.json")
+# max. number of release archives downloaded per run to fill the App-Sizing-History (--sizing-history);
+# the first run with an empty history would download every archive of every release otherwise
+SIZING_HISTORY_DOWNLOADS_PER_RUN = 50
+# release archives are buffered in memory up to this size during download, larger ones are spooled to disk directly
+ZIP_SPOOL_MAX_SIZE = 1024 * 1024
+
+
+
+class _LazyObject:
+    """
+    Proxy creating the object on first attribute access only.
+    Used for objects which read files or set up modules on creation, but are not needed by runs without changes.
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self):
+        if self._instance is None:
+            with self._lock:  # created once, also if first used by concurrent units of run_pipeline()
+                if self._instance is None:
+                    object.__setattr__(self, "_instance", self._factory())
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+
+def _create_device_helper():
+    from devices_helper import DeviceHelper
+    return DeviceHelper()
+
+
+def _create_html_generator():
+    from html_generator import HTMLGenerator
+    return HTMLGenerator(device_helper, path_manager)
+
+
+def _create_release_feed():
+    from release_feed import ReleaseFeed
+    return ReleaseFeed(path_manager)
+
+
 client = GitHubClient()
-release_manager = ReleaseManager(client, appPrefix, appSpecialNames, appExclusion)
-dependency_manager = DependencyManager(client)
-device_helper = DeviceHelper()
-html_generator = HTMLGenerator(device_helper)
+run_journal = RunJournal()
+release_manager = ReleaseManager(client, appPrefix, appSpecialNames, appExclusion, RepoList(client), run_journal)
+dependency_manager = DependencyManager(client, journal=run_journal)
+device_helper = _LazyObject(_create_device_helper)
+path_manager = PathManager()
+html_generator = _LazyObject(_create_html_generator)
+release_feed = _LazyObject(_create_release_feed)
+icon_mirror = None  # IconMirror, if enabled by --mirror-icons
+firmware_footprint = None  # FirmwareFootprint, if enabled by --firmware-footprint
+ofm_drift = None  # OfmDrift, if enabled by --ofm-drift
+
 
+class _SeekableMmap(mmap.mmap):
+    """mmap provides seekable() only since Python 3.13, but zipfile needs it"""
 
+    def seekable(self):
+        return True
 
 
 def process_release_zip(zip_url):
-    content_xml_paths = ['data\\content.xml', 'data/content.xml']
+    """
+    :return: (list of Product from content.xml, AppSizingStat); each None if not available
+    """
+    import tempfile
+    import zipfile
+
+    with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE) as spool:
+        client.download(zip_url, spool)
+        # zipfile needs seekable(), provided by SpooledTemporaryFile only since Python 3.11:
+        # small archives still in memory are moved to disk as well, to use the public file object
+        spool.rollover()
+        spool.flush()
+        # let the OS page in only the parts of the archive actually read
+        with _SeekableMmap(spool.fileno(), 0, access=mmap.ACCESS_READ) as archive:
+            return _analyse_release_zip(zipfile.ZipFile(archive), zip_url)
+
+
+def _analyse_release_zip(zipfile_obj, zip_url):
+    """
+    Members are handed as streams to the analysers, no member is read into memory completely.
+    """
+    import defusedxml.ElementTree as ET  # secure replacement for  import xml.etree.ElementTree as ET
+
+    from app_sizing_stat import AppSizingStat
+    from content_xml import iter_products
 
-    response = client.get_response(zip_url)
-    zipfile_obj = zipfile.ZipFile(BytesIO(response.content))
+    content_xml_paths = ['data\\content.xml', 'data/content.xml']
 
     app_stat = None
-    hardware_info = None
+    products = None
 
     # Check for app xml to read parameter-memory-size
     xml_files = [name for name in zipfile_obj.namelist() if name.endswith('.xml') and name not in content_xml_paths]
@@ -130,87 +222,180 @@ def process_release_zip(zip_url):
     if len(content_xmls) == 0:
         logging.warning(f"No 'data\\content.xml' or 'data/content.xml' found in the archive {zip_url}")
     else:
-        # [[WORK-AROUND]] try to fix for wrong encoding, some releases contains utf-16le:
+        products = []
         try:
             with zipfile_obj.open(content_xmls[0]) as xml_file:
-                xml_content = xml_file.read().decode('utf-8')
-        except UnicodeDecodeError:
-            with zipfile_obj.open(content_xmls[0]) as xml_file:
-                logging.warning(f"((>>WORKAROUND<<)) 'content.xml' not UTF-8 encoded, try fall-back to wrong UTF-16LE: {zip_url}")
-                xml_content = xml_file.read().decode('utf-16le')
-
-        # [[WORK-AROUND]] quick-fix for older releases with broken XML:
-        xml_str = xml_content.replace('<Products>\r\n</Content>', '</Products>\r\n</Content>')
-        if xml_str != xml_content:
-            logging.warning(f"((>>WORKAROUND<<)) Quick-Fixed broken XML in 'content.xml' found in the archive {zip_url}")
-
-        try:
-            root = ET.fromstring(xml_str)
-            hardware_info = [product.get('Name') for product in root.find('Products')]
+                products.extend(iter_products(xml_file, zip_url))
         except ET.ParseError as e:
             logging.error(f"'content.xml' parsing failed in the archive {zip_url}")
+            products = None
             # TODO check hard ending?!
 
-    return hardware_info, app_stat
+    return products, app_stat
+
+
+def _get_asset_cache_key(oam, asset):
+    """
+    :return: key for caching results of process_release_zip, or None if asset can not be identified
+    """
+    cache_key = asset.digest
+    if not cache_key:
+        logging.warning(f"No digest found for asset {asset.name} in {oam}!")
+        # logging.warning(f"asset: {json.dumps(asset.to_json(), indent=4)}")
+        if asset.name and asset.updated_at and asset.size:
+            cache_key = f"{asset.name}__{asset.updated_at}__{asset.size}"
+    return cache_key
+
+
+def _get_asset_cache_path(oam, asset):
+    """
+    :return: path of the cached results of process_release_zip, or None if asset can not be identified
+    """
+    # cache results of process_release_zip: use filename as key inside of oam-directory:
+    cache_key = _get_asset_cache_key(oam, asset)
+    if not cache_key:
+        return None
+    return os.path.join("releases_data", oam, f"{cache_key.replace(':', '_')}.json")
+
+
+def process_release_asset(oam, asset, require_app_stat=False):
+    """
+    Analyse a release archive, using cached results of process_release_zip if available.
+
+    :param require_app_stat: process again, if cached data was created without app statistics
+    :return: (hardware_info, app_stat, products) with app_stat and products as dict;
+             (None, None, None) for unidentifiable assets
+    """
+    out_path = _get_asset_cache_path(oam, asset)
+    if not out_path:
+        logging.info("+++")
+        return None, None, None
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    if os.path.exists(out_path):
+        with open(out_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not require_app_stat or "app_stat" in data:
+            return data.get("hardware_info"), data.get("app_stat"), data.get("products")
+
+    logging.info(f"Fetching release archive {oam} from {asset.browser_download_url}")
+    products, app_stat = process_release_zip(asset.browser_download_url)
+    data = {}
+    if products:
+        data["hardware_info"] = [product.name for product in products]
+        data["products"] = [product._asdict() for product in products]
+    data["app_stat"] = app_stat.to_dict() if app_stat else None
+
+    # complete file or none, so an interrupted run can resume with the archives analysed so far
+    with open(f"{out_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(f"{out_path}.tmp", out_path)
+    return data.get("hardware_info"), data["app_stat"], data.get("products")
+
+
+def process_oam_releases(oam, oam_data):
+    """
+    Analyse the latest release of an OAM.
+
+    :return: (hardware_info, products, app_stat), each None if not available
+    """
+    hardware_info = None
+    products = None
+    app_stat = None
+    oam_releases = oam_data.releases
+    if len(oam_releases) == 0:
+        logging.warning(f"No releases found for {oam}")
+        return hardware_info, products, app_stat
+    latest_release = oam_releases[0]
+    for asset in latest_release.assets:
+        ## TODO check all?
+        asset_hardware_info, asset_app_stat, asset_products = process_release_asset(oam, asset)
+
+        if asset_app_stat is not None:
+            app_stat = asset_app_stat
+        if asset_hardware_info is not None:
+            hardware_info = asset_hardware_info
+            products = asset_products
+            break ## TODO check
+
+    else:
+        logging.warning(f"No assets found for {oam}")
+    return hardware_info, products, app_stat
 
 
 def process_releases(releases_data):
     hardware_mapping = {}
+    hardware_products = {}
     oam_stat = {}
     for oam, oam_data in releases_data.items():
-        oam_releases = oam_data["releases"]
-        if not oam_releases or not isinstance(oam_releases, list) or len(oam_releases) == 0:
-            logging.warning(f"No releases found for {oam}")
-            continue
-        latest_release = oam_releases[0]
-        for asset in latest_release.get('assets', []):
-            ## TODO check all?
-            logging.info(f"Fetching release archive {oam} from {asset['browser_download_url']}")
-
-            # cache results of process_release_zip: use filename as key inside of oam-directory:
-
-            app_stat = None
-            hardware_info = None
-
-            # hardware_info, app_stat = process_release_zip(asset['browser_download_url'])
-            out_dir = os.path.join("releases_data", oam)
-            os.makedirs(out_dir, exist_ok=True)
-            filename = asset.get('digest')
-            if not filename:
-                logging.warning(f"No digest found for asset {asset['name']} in {oam}!")
-                # logging.warning(f"asset: {json.dumps(asset, indent=4)}")
-                if asset.get("name", False) and asset.get("updated_at", False) and asset.get("size", False):
-                    filename = f"{asset.get('name')}__{asset.get('updated_at')}__{asset.get('size')}"
-                else:
-                    logging.info("+++")
-                    continue
-
-            out_path = os.path.join(out_dir, f"{filename.replace(':', '_')}.json")
-            if os.path.exists(out_path):
-                with open(out_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                hardware_info = data.get("hardware_info")
-                app_stat = data.get("app_stat")
-            else:
-                hardware_info, app_stat = process_release_zip(asset['browser_download_url'])
-                data = {}
-                if hardware_info:
-                    data["hardware_info"] = hardware_info
-                if app_stat and False:
-                    data["app_stat"] = app_stat
-
-                with open(out_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-
-            if app_stat is not None:
-                oam_stat[oam] = app_stat
-            if hardware_info is not None:
-                hardware_mapping[oam] = hardware_info
-                break ## TODO check
-
+        hardware_info, products, app_stat = process_oam_releases(oam, oam_data)
+        if app_stat is not None:
+            oam_stat[oam] = app_stat
+        if hardware_info is not None:
+            hardware_mapping[oam] = hardware_info
+            if products is not None:
+                hardware_products[oam] = products
+    return hardware_mapping, hardware_products, oam_stat
+
+
+def process_releases_history(releases_data, history, max_downloads=SIZING_HISTORY_DOWNLOADS_PER_RUN):
+    """
+    Add the App-Sizing-Statistics of all releases to history, which are not already contained.
+
+    Releases are processed newest first over all OAMs (latest release of each OAM, then the one before, ...).
+    At most max_downloads archives not analysed before are downloaded, the remaining releases follow in later runs.
+
+    :param releases_data: releases of all OAMs, as collected by ReleaseManager
+    :param history: AppSizingHistory, already loaded with the results of previous runs
+    :param max_downloads: max. number of release archives to download, None for no limit
+    :return: number of added releases
+    """
+    pending = [
+        (position, oam, release)
+        for oam, oam_data in releases_data.items()
+        for position, release in enumerate(oam_data.releases)
+        if not history.contains(oam, release.tag_name)
+    ]
+    pending.sort(key=lambda item: item[0])
+
+    added_count = 0
+    downloads = 0
+    deferred_count = 0
+    for _, oam, release in pending:
+        for asset in release.assets:
+            cache_path = _get_asset_cache_path(oam, asset)
+            if cache_path and not os.path.exists(cache_path):
+                if max_downloads is not None and downloads >= max_downloads:
+                    deferred_count += 1
+                    break
+                downloads += 1
+            hardware_info, app_stat, products = process_release_asset(oam, asset, require_app_stat=True)
+            if app_stat:
+                history.add(oam, release, _get_asset_cache_key(oam, asset), app_stat)
+                added_count += 1
+                break
         else:
-            logging.warning(f"No assets found for {oam}")
-    return hardware_mapping, oam_stat
+            logging.info(f"No App-Sizing-Stat available for {oam} {release.tag_name}")
+    if deferred_count > 0:
+        logging.info(f"Download limit of {max_downloads} archives reached, "
+                     f"App-Sizing-Stat of {deferred_count} releases is added in the next runs")
+    logging.info(f"Added App-Sizing-Stat of {added_count} releases to history")
+    return added_count
+
+
+def update_sizing_history(releases_data):
+    from app_sizing_history import AppSizingHistory
+
+    history = AppSizingHistory().load()
+    if process_releases_history(releases_data, history) > 0:
+        history.save()
+
+    for oam, (previous, latest) in history.growth_alerts().items():
+        logging.warning(f"Parameter memory of {oam} grew from {previous} to {latest} bytes in latest release")
+
+    for oam in history.oam_names:
+        _write_json_file(path_manager.get_oam_path(oam, filename='sizing.json'), history.to_trend_json(oam))
+    html_generator.update_sizing_trends(history)
 
 
 def generate_oam_data(oam_dependencies, oam_hardware, oam_details):
@@ -234,7 +419,7 @@ def generate_oam_data(oam_dependencies, oam_hardware, oam_details):
     oam_data = {}
     for oam, dependencies in oam_dependencies.items():
         oam_data[oam] = {
-            "description": oam_details.get(oam, {}).get("description", "(keine Kurzbeschreibung)"),
+            "description": oam_details[oam].description if oam in oam_details else "(keine Kurzbeschreibung)",
             "modules": dependencies,
             "modules_internal": internal_modules.get(oam, []),
             "devices": [],  # set empty list for OAMs without releases # TODO check cleanup of data-collection
@@ -256,7 +441,7 @@ def generate_oam_data(oam_dependencies, oam_hardware, oam_details):
 
 
 def _write_json_file(filename, data):
-    with open(filename, 'w', encoding='utf-8') as outfile:
+    with path_manager.open_output(filename) as outfile:
         json.dump(data, outfile, indent=4)
 
 
@@ -264,76 +449,486 @@ def write_releases_json(oam_releases_data):
     releases_data = {
         "OpenKnxContentType": "OpenKNX/OAM/Releases",
         "OpenKnxFormatVersion": "v0.3.0",
-        "data": oam_releases_data
+        "data": releases_to_json(oam_releases_data)
     }
-    _write_json_file(os.path.join("docs", 'releases.json'), releases_data)
+    _write_json_file(path_manager.create_path(filename='releases.json'), releases_data)
     # logging.info(f"OAM Release Data: {json.dumps(oam_releases_data, indent=4)}")
 
 
-def main(force_update=False):
-    oam_repos = release_manager.fetch_app_repos()
+def read_releases_json():
+    """
+    :return: dict OAM-name -> OamRecord as written by the last run, empty if not available
+    """
+    releases_file = os.path.join(path_manager.get_base_path(), 'releases.json')
+    if not os.path.exists(releases_file):
+        return {}
+    with open(releases_file, 'r', encoding='utf-8') as f:
+        return releases_from_json(json.load(f)["data"])
 
-    delta = timedelta(hours=4, minutes=45)
-    now = datetime.now(timezone.utc)
-    oam_updated = {
-        repo["name"]: repo["updated_at"]
-        for repo in oam_repos
-        if (now - datetime.strptime(repo["updated_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)) <= delta or (now - datetime.strptime(repo["pushed_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)) <= delta
-    }
-    if not force_update and len(oam_updated) == 0:
-        logging.info(f"No repos have been updated in the last {delta} => NO need for updates!")
-        return  # no need to update for unchanged OAM-repos
-    logging.info(f"The {len(oam_updated)} following repos have been updated in the last {delta}: {oam_updated}")
 
-    # release-data (base) for usage in openknx-toolbox
-    oam_releases_data = release_manager.fetch_apps_releases(oam_repos)
+def load_ofm_data():
+    # read ofm_data from ofms.json
+    with open(os.path.join("data", 'ofms.json'), 'r', encoding='utf-8') as f:
+        ofm_data = {
+            f'{(ofm["parent_oam"]+"/" if "parent_oam" in ofm else "")}{ofm["name"]}': OfmRecord.from_json(ofm)
+            for ofm in json.load(f)
+        }
+    for ofm_name, ofm in ofm_data.items():
+        if hasattr(ofm, 'icon'):
+            icon = ofm.icon.split('@')
+            icon_name = icon[0]
+            icon_repo_def = (icon[1] if len(icon) == 2 else "OGM-Common").split('#')
+            icon_repo = icon_repo_def[0]
+            if icon_repo == '.':
+                icon_repo = ofm_name.split('/')[0] # for internal modules the format is OAM/module
+            icon_repo_ref = icon_repo_def[1] if len(icon_repo_def)==2 else "v1"
+            ofm.icon_url = f"https://raw.githubusercontent.com/OpenKNX/{icon_repo}/refs/heads/{icon_repo_ref}/src/Baggages/Icons/{icon_name}.png"
+    if icon_mirror is not None:
+        icon_mirror.mirror(ofm_data)
+    logging.info(ofm_data_to_json(ofm_data))
+    return ofm_data
+
 
-    oam_hardware_raw, oam_stat = process_releases(oam_releases_data)
+def update_release_outputs(oam_releases_data, sizing_history=False):
+    """
+    Analyse release archives and create all outputs based on release data only.
+
+    :return: (oam_hardware_raw, oam_hardware_products, oam_stat, oam_hardware) for all OAMs
+    """
+    oam_hardware_raw, oam_hardware_products, oam_stat = process_releases(oam_releases_data)
+    oam_hardware = write_release_data_outputs(oam_releases_data, oam_hardware_raw, oam_hardware_products, oam_stat, sizing_history)
+    html_generator.update_html(oam_releases_data)
+    return oam_hardware_raw, oam_hardware_products, oam_stat, oam_hardware
+
+
+def write_release_data_outputs(oam_releases_data, oam_hardware_raw, oam_hardware_products, oam_stat, sizing_history=False):
+    """
+    Write hardware mapping, releases.json and app statistics for the analysed releases of all OAMs.
+
+    :return: mapped hardware of all OAMs
+    """
     _write_json_file('hardware_mapping_raw.json', oam_hardware_raw)
+    _write_json_file('hardware_products_raw.json', oam_hardware_products)
 
+    # order number and hardware id of the products map devices with unknown names
+    oam_products_by_name = {
+        oam: {product["name"]: product for product in products}
+        for oam, products in oam_hardware_products.items()
+    }
     oam_hardware = {
-        oam: [device_helper.hw_name_mapping(oam, d) for d in oam_device_list]
+        oam: [device_helper.hw_name_mapping(oam, d, oam_products_by_name.get(oam, {}).get(d)) for d in oam_device_list]
         for oam, oam_device_list in oam_hardware_raw.items()
     }
     _write_json_file('hardware_mapping.json', oam_hardware)
 
     for oam, oam_data in oam_releases_data.items():
-        oam_data["hw_avail_open"] = sum(1 for name in oam_hardware.get(oam, []) if device_helper.is_open_device(name))
+        oam_data.hw_avail_open = sum(1 for name in oam_hardware.get(oam, []) if device_helper.is_open_device(name))
 
     # write releases.json for openknx-toolbox
     write_releases_json(oam_releases_data)
+    # small feed of new releases, for polling clients
+    release_feed.update(oam_releases_data)
 
     # app statistics
     for oamName, oamStat in oam_stat.items():
         logging.info(f"App-Sizing-Stat for {oamName}: {oamStat}")
+    if sizing_history:
+        update_sizing_history(oam_releases_data)
+    return oam_hardware
 
-    html_generator.update_html(oam_releases_data)
-    all_oam_dependencies = dependency_manager.fetch_all_dependencies(oam_repos)
-
-    # read ofm_data from ofms.json
-    with open(os.path.join("data", 'ofms.json'), 'r', encoding='utf-8') as f:
-        ofm_data = {
-            f'{(ofm["parent_oam"]+"/" if "parent_oam" in ofm else "")}{ofm["name"]}': ofm
-            for ofm in json.load(f)
-        }
-    for ofm_name, ofm in ofm_data.items():
-        if 'icon' in ofm:
-            icon = ofm['icon'].split('@')
-            icon_name = icon[0]
-            icon_repo_def = (icon[1] if len(icon) == 2 else "OGM-Common").split('#')
-            icon_repo = icon_repo_def[0]
-            if icon_repo == '.':
-                icon_repo = ofm_name.split('/')[0] # for internal modules the format is OAM/module
-            icon_repo_ref = icon_repo_def[1] if len(icon_repo_def)==2 else "v1"
-            ofm["icon_url"] = f"https://raw.githubusercontent.com/OpenKNX/{icon_repo}/refs/heads/{icon_repo_ref}/src/Baggages/Icons/{icon_name}.png"
-    logging.info(ofm_data)
 
+def update_overview_outputs(all_oam_dependencies, oam_hardware_raw, oam_hardware, oam_releases_data, ofm_data):
     # Generate Dependencies Table
     oam_data = generate_oam_data(all_oam_dependencies, oam_hardware, oam_releases_data)
     html_generator.update_overview_tables(oam_data, ofm_data)
 
+    if firmware_footprint is not None:
+        footprints = firmware_footprint.analyse(oam_releases_data, oam_hardware_raw, oam_hardware)
+        _write_json_file(path_manager.create_path(filename='footprint.json'), footprints)
+        html_generator.update_firmware_footprint(footprints, firmware_footprint.by_device(footprints))
+
+    if ofm_drift is not None:
+        drift = ofm_drift.analyse(all_oam_dependencies)
+        _write_json_file(path_manager.create_path(filename='drift.json'), drift)
+        html_generator.update_ofm_drift(drift, ofm_drift.by_oam(drift))
+
+
+def _parse_github_time(value):
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+
+def _load_refresh_state():
+    """
+    :return: dict repo name -> time of last successful fetch (ISO-format)
+    """
+    if not os.path.exists(REFRESH_STATE_PATH):
+        return {}
+    with open(REFRESH_STATE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_refresh_state(repo_names, now):
+    refresh_state = _load_refresh_state()
+    refresh_state.update({name: now.strftime("%Y-%m-%dT%H:%M:%SZ") for name in repo_names})
+    os.makedirs(os.path.dirname(REFRESH_STATE_PATH), exist_ok=True)
+    with open(REFRESH_STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(refresh_state, f, indent=4)
+
+
+def defer_repos(names, reused, kept, previous_releases=None):
+    """
+    Defer the update of repos to the next run. Repos with data from the previous run are processed with it,
+    the published pages of all others are kept as they are (instead of removing them as stale).
+
+    :param reused: dict name -> (releases, dependencies) of the previous run, extended by the deferred repos with data
+    :param kept: set of names, extended by the deferred repos without data
+    :param previous_releases: content of releases.json, if already read
+    """
+    if not names:
+        return
+    if previous_releases is None:
+        previous_releases = read_releases_json()
+    previous_dependencies = dependency_manager.load_all_dependencies()
+    for name in names:
+        if name in previous_releases:
+            reused[name] = (previous_releases[name], previous_dependencies.get(name, {}))
+        else:
+            logging.warning(f"Keep published pages of {name} unchanged: no API budget and no data from previous run")
+            kept.add(name)
+
+
+def schedule_repos(oam_repos, changed_names):
+    """
+    Order repos by importance and defer refreshes, if the remaining API budget is too short for all:
+    changed repos (newest push first) and repos without data from previous runs first,
+    then all other repos with the oldest refresh first.
+
+    :return: (repos to fetch in this run ordered by importance, dict name -> (releases, dependencies) of the previous run
+              for deferred repos, set of names of deferred repos without previous data), see defer_repos()
+    """
+    previous_releases = read_releases_json()
+    refresh_state = _load_refresh_state()
+    items = []
+    for repo in oam_repos:
+        name = repo.name
+        if name in changed_names or name not in previous_releases:
+            priority = (0, -_parse_github_time(repo.pushed_at).timestamp())
+        else:
+            priority = (1, refresh_state.get(name, ""))
+        items.append(WorkItem(priority, API_CALLS_PER_REPO, repo))
+    scheduled, deferred = client.budget.plan(items)
+
+    reused = {}
+    kept = set()
+    defer_repos([item.payload.name for item in deferred], reused, kept, previous_releases)
+    return [item.payload for item in scheduled], reused, kept
+
+
+def fetch_scheduled_releases(scheduled_repos, reused, kept):
+    """
+    Fetch the releases of the repos in order of importance.
+    If the rate limit is exhausted on the way, the remaining repos are deferred to the next run, see defer_repos().
+
+    :return: dict name -> OamRecord of the fetched repos
+    """
+    releases_data = {}
+    for index, repo in enumerate(scheduled_repos):
+        try:
+            releases_data[repo.name] = release_manager.fetch_repo_releases(repo)
+        except RateLimitExhausted as e:
+            logging.warning(f"{e} => defer {len(scheduled_repos) - index} repos to next run")
+            defer_repos([repo.name for repo in scheduled_repos[index:]], reused, kept)
+            break
+    return releases_data
+
+
+def _process_repo(repo, body_renderer, reused=None):
+    """
+    Complete processing of a single app repo as independent unit for run_pipeline():
+    fetch releases, analyse the latest release archive, fetch dependencies and create the per-OAM release pages.
+
+    :param reused: (releases, dependencies) of the previous run, to use instead of fetching
+    """
+    name = repo.name
+    if reused is None:
+        oam_data = release_manager.fetch_repo_releases(repo)
+    else:
+        oam_data = reused[0]
+    hardware_info, products, app_stat = process_oam_releases(name, oam_data)
+    dependencies = dependency_manager.fetch_dependencies(repo) if reused is None else reused[1]
+    html_generator.update_html_for_repo(name, oam_data, body_renderer)
+    return oam_data, hardware_info, products, app_stat, dependencies
+
+
+def run_pipeline(oam_repos, scheduled_repos, reused, kept, sizing_history=False, max_workers=PIPELINE_WORKERS):
+    """
+    Process all repos as independent units with bounded concurrency,
+    only the pages aggregating all OAMs are created after all units are finished.
+
+    :param oam_repos: all repos in order of output
+    :param scheduled_repos: repos to fetch, ordered by importance
+    :param reused: data of deferred repos, see schedule_repos(); extended by repos deferred on exhausted rate limit
+    :param kept: deferred repos without data, see schedule_repos(); extended like reused
+    """
+    from release_body_renderer import ReleaseBodyRenderer
+
+    body_renderer = ReleaseBodyRenderer()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # most important units are started first
+        futures = {
+            repo.name: executor.submit(_process_repo, repo, body_renderer, reused.get(repo.name))
+            for repo in scheduled_repos + [repo for repo in oam_repos if repo.name in reused]
+        }
+        results = {}
+        exhausted = []
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except RateLimitExhausted:
+                exhausted.append(name)
+        if exhausted:
+            logging.warning(f"Rate limit exhausted => defer {len(exhausted)} repos to next run")
+            defer_repos(exhausted, reused, kept)
+            repos_by_name = {repo.name: repo for repo in oam_repos}
+            retries = {
+                name: executor.submit(_process_repo, repos_by_name[name], body_renderer, reused[name])
+                for name in exhausted if name in reused
+            }
+            results.update((name, future.result()) for name, future in retries.items())
+    body_renderer.save()
+    oam_repos = [repo for repo in oam_repos if repo.name in results]
+
+    oam_releases_data = {}
+    oam_hardware_raw = {}
+    oam_hardware_products = {}
+    oam_stat = {}
+    all_oam_dependencies = {}
+    for repo in oam_repos:
+        name = repo.name
+        oam_data, hardware_info, products, app_stat, dependencies = results[name]
+        oam_releases_data[name] = oam_data
+        if app_stat is not None:
+            oam_stat[name] = app_stat
+        if hardware_info is not None:
+            oam_hardware_raw[name] = hardware_info
+            if products is not None:
+                oam_hardware_products[name] = products
+        if dependencies:
+            all_oam_dependencies[name] = dependencies
+    dependency_manager.save_all_dependencies(all_oam_dependencies)
+
+    oam_hardware = write_release_data_outputs(oam_releases_data, oam_hardware_raw, oam_hardware_products, oam_stat, sizing_history)
+    html_generator.update_html_overview(oam_releases_data)
+    ofm_data = load_ofm_data()
+    update_overview_outputs(all_oam_dependencies, oam_hardware_raw, oam_hardware, oam_releases_data, ofm_data)
+    save_snapshot(create_snapshot(oam_repos, oam_releases_data, oam_hardware_raw, oam_hardware_products, oam_hardware,
+                                  oam_stat, all_oam_dependencies, ofm_data))
+
+
+def main(force_update=False, sizing_history=False, staged=False, pipeline=False, full_repo_list=False):
+    oam_repos = release_manager.fetch_app_repos(full_repo_list)
+
+    now = datetime.now(timezone.utc)
+    # pushed or updated since processed by the last run (also changes of metadata only, seen on full refresh)
+    oam_updated = release_manager.repo_list.changed_repos(oam_repos)
+    if not force_update and len(oam_updated) == 0:
+        logging.info("No repos have been updated since the last run => NO need for updates!")
+        return  # no need to update for unchanged OAM-repos
+    logging.info(f"The {len(oam_updated)} following repos have been updated since the last run: {oam_updated}")
+    run_journal.start()
+
+    scheduled_repos, reused, kept = schedule_repos(oam_repos, oam_updated)
+    scheduled_names = {repo.name for repo in scheduled_repos}
+    oam_repos = [repo for repo in oam_repos if repo.name in scheduled_names or repo.name in reused]
+
+    path_manager.reset_planning()
+    if staged:
+        path_manager.start_staging()
+
+    if pipeline:
+        run_pipeline(oam_repos, scheduled_repos, reused, kept, sizing_history)
+    else:
+        # release-data (base) for usage in openknx-toolbox
+        fetched_releases_data = fetch_scheduled_releases(scheduled_repos, reused, kept)
+        oam_repos = [repo for repo in oam_repos if repo.name in fetched_releases_data or repo.name in reused]
+        oam_releases_data = {
+            repo.name: fetched_releases_data[repo.name] if repo.name in fetched_releases_data else reused[repo.name][0]
+            for repo in oam_repos
+        }
+
+        oam_hardware_raw, oam_hardware_products, oam_stat, oam_hardware = update_release_outputs(oam_releases_data, sizing_history)
+        all_oam_dependencies = dependency_manager.fetch_all_dependencies(
+            oam_repos, reuse={name: dependencies for name, (_, dependencies) in reused.items()})
+        ofm_data = load_ofm_data()
+        update_overview_outputs(all_oam_dependencies, oam_hardware_raw, oam_hardware, oam_releases_data, ofm_data)
+        save_snapshot(create_snapshot(oam_repos, oam_releases_data, oam_hardware_raw, oam_hardware_products, oam_hardware,
+                                      oam_stat, all_oam_dependencies, ofm_data))
+
+    # deferred repos without data are not part of this run, but still published
+    path_manager.keep_entities("oam", kept)
+    if staged:
+        path_manager.publish()
+    fetched_names = scheduled_names - set(reused) - kept
+    _save_refresh_state(fetched_names, now)
+    # deferred repos are reported as changed again in the next run
+    release_manager.repo_list.mark_processed([repo for repo in oam_repos if repo.name in fetched_names])
+    run_journal.complete()
+
+
+def update_oams(oam_names, sizing_history=False, staged=False):
+    """
+    Incremental update for the given OAMs only; data of all other OAMs is taken from the last run.
+
+    :param oam_names: names of the changed app repos
+    """
+    logging.info(f"Incremental update of {sorted(oam_names)}")
+    run_journal.start()
+    oam_repos = [repo for repo in (release_manager.fetch_app_repo(name) for name in sorted(oam_names)) if repo]
+
+    oam_releases_data = read_releases_json()
+    # repos deferred on exhausted rate limit keep the data of the last run
+    fetched_releases_data = fetch_scheduled_releases(oam_repos, {}, set())
+    oam_releases_data.update(fetched_releases_data)
+
+    all_oam_dependencies = dependency_manager.load_all_dependencies()
+    for repo in oam_repos:
+        dependencies = dependency_manager.fetch_dependencies(repo)
+        if dependencies:
+            all_oam_dependencies[repo.name] = dependencies
+        else:
+            all_oam_dependencies.pop(repo.name, None)
+    dependency_manager.save_all_dependencies(all_oam_dependencies)
+
+    path_manager.reset_planning()
+    if staged:
+        path_manager.start_staging()
+    oam_hardware_raw, oam_hardware_products, oam_stat, oam_hardware = update_release_outputs(oam_releases_data, sizing_history)
+    ofm_data = load_ofm_data()
+    update_overview_outputs(all_oam_dependencies, oam_hardware_raw, oam_hardware, oam_releases_data, ofm_data)
+    if staged:
+        path_manager.publish()
+
+    # repo info of unchanged OAMs from previous snapshot
+    all_repos = {repo["name"]: Repo.from_json(repo) for repo in _load_previous_snapshot().get("repos", [])}
+    all_repos.update({repo.name: repo for repo in oam_repos})
+    save_snapshot(create_snapshot([all_repos[name] for name in oam_releases_data if name in all_repos],
+                                  oam_releases_data, oam_hardware_raw, oam_hardware_products, oam_hardware,
+                                  oam_stat, all_oam_dependencies, ofm_data))
+    release_manager.repo_list.mark_processed([repo for repo in oam_repos if repo.name in fetched_releases_data])
+    run_journal.complete()
+
+
+def _load_previous_snapshot():
+    if not os.path.exists(DEFAULT_SNAPSHOT_PATH):
+        return {}
+    try:
+        return load_snapshot()
+    except ValueError as e:
+        logging.warning(f"Ignore previous snapshot: {e}")
+        return {}
+
+
+def render_snapshot(snapshot, staged=False):
+    """
+    Create the complete docs-tree from a snapshot, without any access to GitHub.
+    """
+    logging.info(f"Render snapshot created at {snapshot['created_at']}")
+    path_manager.reset_planning()
+    if staged:
+        path_manager.start_staging()
+    oam_releases_data = releases_from_json(snapshot["releases"])
+    write_releases_json(oam_releases_data)
+    html_generator.update_html(oam_releases_data)
+    update_overview_outputs(snapshot["dependencies"], snapshot["hardware_raw"], snapshot["hardware"], oam_releases_data,
+                            ofm_data_from_json(snapshot["ofm_data"]))
+    if staged:
+        path_manager.publish()
+
+
+def watch(sizing_history=False, staged=False, run_lock=None):
+    """
+    Long-running mode: full update once, followed by incremental updates triggered by the org events feed.
+
+    :param run_lock: RunLock held during each update only, so other runs are possible while waiting for events
+    """
+    from event_watcher import OrgEventWatcher
+
+    def locked_update(update, *args):
+        if run_lock is None:
+            return update(*args)
+        with run_lock:
+            return update(*args)
+
+    watcher = OrgEventWatcher(client, release_manager.is_app_repo_name)
+    # starting point before the full update, so changes during the full update are processed afterwards
+    watcher.start()
+    locked_update(main, True, sizing_history, staged)
+    watcher.watch(lambda oam_names: locked_update(update_oams, oam_names, sizing_history, staged))
+
 
 if __name__ == "__main__":
     import sys
 
-    main('--force' in sys.argv)
+    if '--watch' in sys.argv:
+        # never returns, so options of a single run are not possible
+        one_shot_options = [arg for arg in sys.argv[1:]
+                            if arg in ('--force', '--pipeline', '--full-repo-list', '--validate-links', '--profile')
+                            or arg.startswith('--wait-lock')]
+        if one_shot_options:
+            sys.exit(f"--watch can not be combined with {' '.join(one_shot_options)}")
+
+    if '--mirror-icons' in sys.argv:
+        from icon_mirror import IconMirror
+
+        icon_mirror = IconMirror(path_manager, sprite='--icon-sprite' in sys.argv)
+    if '--firmware-footprint' in sys.argv:
+        from firmware_footprint import FirmwareFootprint
+
+        firmware_footprint = FirmwareFootprint(client)
+    if '--ofm-drift' in sys.argv:
+        from ofm_drift import OfmDrift
+
+        ofm_drift = OfmDrift(client, release_manager.repo_list)
+
+    if '--profile' in sys.argv:
+        # CPU-time and memory per stage => profile/<stage>.*
+        # cProfile covers the calling thread only, use without --pipeline for complete stats
+        from stage_profiler import StageProfiler
+
+        profiler = StageProfiler()
+        profiler.instrument(release_manager, "fetch_app_repos")
+        profiler.instrument(sys.modules[__name__], "fetch_scheduled_releases")
+        profiler.instrument(sys.modules[__name__], "process_releases")
+        profiler.instrument(dependency_manager, "fetch_all_dependencies")
+        profiler.instrument(html_generator, "update_html")
+        profiler.instrument(html_generator, "update_overview_tables")
+
+    if '--watch' in sys.argv:
+        # updates wait for other runs, the lock is held only during an update
+        watch('--sizing-history' in sys.argv, '--staged' in sys.argv, RunLock(timeout=None))
+        sys.exit(0)
+
+    # only one run at a time: exit immediately if another run is active, or wait with --wait-lock[=seconds]
+    wait_lock = next((arg for arg in sys.argv if arg.startswith('--wait-lock')), None)
+    lock_timeout = 0 if wait_lock is None else (float(wait_lock.split('=', 1)[1]) if '=' in wait_lock else None)
+    run_lock = RunLock(timeout=lock_timeout)
+    try:
+        run_lock.acquire()
+    except RunLockBusy as e:
+        logging.warning(f"{e} => skip this run")
+        sys.exit(0)
+
+    try:
+        main('--force' in sys.argv, '--sizing-history' in sys.argv, '--staged' in sys.argv, '--pipeline' in sys.argv,
+             '--full-repo-list' in sys.argv)
+
+        if '--validate-links' in sys.argv:
+            from link_validator import LinkValidator, write_report
+
+            write_report(LinkValidator(path_manager.get_base_path()).validate())
+    except RateLimitExhausted as e:
+        # outside of the scheduled work, e.g. on listing the repos: nothing to publish
+        logging.error(e)
+        sys.exit(str(e))
+    finally:
+        run_lock.release()
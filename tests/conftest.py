@@ -0,0 +1,7 @@
+# Test Setup: Scripts are Imported as Top-Level Modules, as when Run from scripts/
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
@@ -0,0 +1,84 @@
+# Tests for the Columnar Store of App-Sizing-Statistics
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import json
+
+from app_sizing_history import AppSizingHistory
+from model import Release
+
+
+def _release(tag_name, published_at, prerelease=False):
+    return Release(prerelease, tag_name, published_at=published_at)
+
+
+def _history(path, *rows):
+    history = AppSizingHistory(str(path))
+    for oam, tag_name, published_at, parameter_memory_size in rows:
+        history.add(oam, _release(tag_name, published_at), f"sha256:{oam}-{tag_name}",
+                    {"parameter_memory_size": parameter_memory_size, "file_size": 1000})
+    return history
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "app_sizing_history.json"
+    history = _history(path,
+                       ("OAM-A", "v1.0", "2025-01-01T00:00:00Z", 100),
+                       ("OAM-B", "v2.0", "2025-01-02T00:00:00Z", 200),
+                       ("OAM-A", "v1.1", "2025-02-01T00:00:00Z", 150))
+    history.add("OAM-B", _release("v2.1-beta", "2025-03-01T00:00:00Z", prerelease=True), "beta.zip",
+                {"parameter_memory_size": 250})
+    history.save()
+
+    loaded = AppSizingHistory(str(path)).load()
+    assert len(loaded) == 4
+    assert loaded.oam_names == ["OAM-A", "OAM-B"]
+    assert loaded.col_oam == history.col_oam
+    assert loaded.col_prerelease.tolist() == [0, 0, 0, 1]
+    assert loaded.col_asset == history.col_asset
+    for metric in AppSizingHistory.METRICS:
+        assert loaded.column(metric) == history.column(metric)
+    assert loaded.contains("OAM-A", "v1.1") and not loaded.contains("OAM-A", "v2.0")
+    assert loaded.series("OAM-B", "parameter_memory_size") == [
+        ("v2.0", "2025-01-02T00:00:00Z", 200), ("v2.1-beta", "2025-03-01T00:00:00Z", 250)]
+
+    # saved and loaded again: identical store
+    saved = path.read_text(encoding="utf-8")
+    loaded.save()
+    assert path.read_text(encoding="utf-8") == saved
+
+
+def test_load_fills_metrics_missing_in_old_store(tmp_path):
+    path = tmp_path / "app_sizing_history.json"
+    _history(path, ("OAM-A", "v1.0", "2025-01-01T00:00:00Z", 100)).save()
+    data = json.loads(path.read_text(encoding="utf-8"))
+    del data["columns"]["script_size"]
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    loaded = AppSizingHistory(str(path)).load()
+    assert loaded.column("script_size").tolist() == [0]
+    assert loaded.column("parameter_memory_size").tolist() == [100]
+
+
+def test_load_ignores_unsupported_format(tmp_path):
+    path = tmp_path / "app_sizing_history.json"
+    path.write_text(json.dumps({"OpenKnxFormatVersion": "v0.0.1", "oams": ["OAM-A"], "columns": {}}), encoding="utf-8")
+    assert len(AppSizingHistory(str(path)).load()) == 0
+
+
+def test_growth_alerts_compare_latest_two_releases_by_publishing_time(tmp_path):
+    history = _history(tmp_path / "app_sizing_history.json",
+                       # added out of order: latest release is v1.2
+                       ("OAM-Grown", "v1.2", "2025-03-01T00:00:00Z", 120),
+                       ("OAM-Grown", "v1.0", "2025-01-01T00:00:00Z", 50),
+                       ("OAM-Grown", "v1.1", "2025-02-01T00:00:00Z", 100),
+                       # +10% is not more than the threshold
+                       ("OAM-Stable", "v1.0", "2025-01-01T00:00:00Z", 100),
+                       ("OAM-Stable", "v1.1", "2025-02-01T00:00:00Z", 110),
+                       ("OAM-Shrunk", "v1.0", "2025-01-01T00:00:00Z", 100),
+                       ("OAM-Shrunk", "v1.1", "2025-02-01T00:00:00Z", 50),
+                       ("OAM-Single", "v1.0", "2025-01-01T00:00:00Z", 100),
+                       ("OAM-FromZero", "v1.0", "2025-01-01T00:00:00Z", 0),
+                       ("OAM-FromZero", "v1.1", "2025-02-01T00:00:00Z", 100))
+    assert history.growth_alerts() == {"OAM-Grown": (100, 120)}
+    assert history.growth_alerts(threshold=0.05) == {"OAM-Grown": (100, 120), "OAM-Stable": (100, 110)}
+    assert history.growth_alerts(metric="file_size") == {}
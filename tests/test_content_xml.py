@@ -0,0 +1,61 @@
+# Tests for Reading Products from content.xml of Releases
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import codecs
+from io import BytesIO
+
+import pytest
+
+from content_xml import Product, detect_xml_encoding, iter_products
+
+CONTENT_XML = (
+    '<?xml version="1.0" encoding="{encoding}"?>\r\n'
+    '<KNX xmlns="http://knx.org/xml/project/20"><Content><Products>'
+    '<Product Name="OpenKNX REG1 Basismodul" OrderNumber="REG1-Base" HardwareId="M-00FA_H-0001"/>'
+    '<Product Name="Gerät ÄÖÜ" OrderNumber="UP1-ÄÖÜ"/>'
+    '</Products>\r\n</Content></KNX>'
+)
+PRODUCTS = [
+    Product("OpenKNX REG1 Basismodul", "REG1-Base", "M-00FA_H-0001"),
+    Product("Gerät ÄÖÜ", "UP1-ÄÖÜ", None),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [3, 64 * 1024])
+def test_utf8_with_declaration(chunk_size):
+    data = CONTENT_XML.format(encoding="utf-8").encode('utf-8')
+    assert list(iter_products(BytesIO(data), chunk_size=chunk_size)) == PRODUCTS
+
+
+@pytest.mark.parametrize("chunk_size", [3, 64 * 1024])
+def test_utf16le_with_bom_and_utf8_declaration(chunk_size):
+    # as written by older releases: utf-16le, but declared as utf-8
+    data = codecs.BOM_UTF16_LE + CONTENT_XML.format(encoding="utf-8").encode('utf-16-le')
+    assert detect_xml_encoding(data) == ('utf-16-le', 2)
+    assert list(iter_products(BytesIO(data), chunk_size=chunk_size)) == PRODUCTS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64 * 1024])
+def test_repair_of_broken_products_end(chunk_size):
+    broken = CONTENT_XML.format(encoding="utf-8").replace('</Products>\r\n</Content>', '<Products>\r\n</Content>')
+    assert list(iter_products(BytesIO(broken.encode('utf-8')), chunk_size=chunk_size)) == PRODUCTS
+
+
+def test_repair_of_broken_products_end_in_utf16le():
+    broken = CONTENT_XML.format(encoding="utf-16").replace('</Products>\r\n</Content>', '<Products>\r\n</Content>')
+    data = codecs.BOM_UTF16_LE + broken.encode('utf-16-le')
+    assert list(iter_products(BytesIO(data), chunk_size=7)) == PRODUCTS
+
+
+def test_source_is_read_in_chunks():
+    class ChunkCountingFile(BytesIO):
+        sizes = []
+
+        def read(self, size=-1):
+            self.sizes.append(size)
+            return super().read(size)
+
+    data = CONTENT_XML.format(encoding="utf-8").encode('utf-8')
+    source = ChunkCountingFile(data)
+    assert list(iter_products(source, chunk_size=16)) == PRODUCTS
+    assert all(0 < size <= 256 for size in source.sizes)
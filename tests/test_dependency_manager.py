@@ -0,0 +1,58 @@
+# Tests for Reading the Dependencies of OAMs
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import logging
+import os
+
+from dependency_manager import DependencyEntry, DependencyManager, parse_dependencies_txt
+from model import Repo
+
+DEPENDENCIES_TXT = """\
+commit                                    branch  path               url
+# generated by OpenKNX-Build-Process
+0123456789abcdef0123456789abcdef01234567  v1      lib/OGM-Common     https://github.com/OpenKNX/OGM-Common.git
+fedcba9876543210fedcba9876543210fedcba98  main    lib/OFM-LogicModule
+
+invalid-line
+"""
+
+
+def test_parse_dependencies_txt():
+    entries, diagnostics = parse_dependencies_txt(DEPENDENCIES_TXT)
+    assert entries == [
+        DependencyEntry("0123456789abcdef0123456789abcdef01234567", "v1", "lib/OGM-Common",
+                        "https://github.com/OpenKNX/OGM-Common.git", "OGM-Common"),
+        DependencyEntry("fedcba9876543210fedcba9876543210fedcba98", "main", "lib/OFM-LogicModule",
+                        "https://github.com/OpenKNX/OFM-LogicModule.git", "OFM-LogicModule", False),
+    ]
+    # the comment and the empty line are no diagnostics
+    assert [(d.line_number, d.level) for d in diagnostics] == [(4, logging.WARNING), (6, logging.ERROR)]
+    assert "invalid-line" in diagnostics[1].message
+
+
+class FakeResponse:
+    text = DEPENDENCIES_TXT
+
+
+class FakeClient:
+    def __init__(self):
+        self.urls = []
+
+    def get_response(self, url, allowed_not_found=False):
+        self.urls.append(url)
+        return FakeResponse()
+
+
+def test_cache_keeps_only_current_state_of_repo(tmp_path):
+    client = FakeClient()
+    manager = DependencyManager(client, cache_dir=str(tmp_path))
+    repo = Repo("OAM-Test", default_branch="main", pushed_at="2025-01-01T00:00:00Z")
+    dependencies = manager.fetch_dependencies(repo)
+    assert set(dependencies) == {"OGM-Common", "OFM-LogicModule"}
+    assert manager.fetch_dependencies(repo) == dependencies
+    assert len(client.urls) == 1
+
+    pushed = Repo("OAM-Test", default_branch="main", pushed_at="2025-02-01T00:00:00Z")
+    manager.fetch_dependencies(pushed)
+    assert len(client.urls) == 2
+    assert os.listdir(tmp_path / "OAM-Test") == ["dependencies@main@2025-02-01T00_00_00Z.json"]
@@ -0,0 +1,88 @@
+# Tests for the OAM x (OFM + Device) Membership Bitsets of the Overview Tables
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+from types import SimpleNamespace
+
+import pytest
+
+from html_generator import HTMLGenerator
+from membership_matrix import MembershipMatrix
+
+OAM_DATA = {
+    "OAM-Logic": {"description": "Logik", "modules": {"OFM-Common": {}, "OFM-Logic": {}, "OFM-Only": {}},
+                  "modules_internal": ["Intern"], "devices": ["REG1", "PiPico", "Other-A"]},
+    "OAM-Sensor": {"description": "Sensor", "modules": {"OFM-Common": {}, "OFM-Logic": {}, "OFM-Unknown": {}},
+                   "modules_internal": [], "devices": ["REG1", "Sensor-UP"]},
+    "OAM-Switch": {"description": "", "modules": {"OFM-Common": {}},
+                   "modules_internal": [], "devices": ["REG1", "PiPico", "Other-A", "Other-B"]},
+}
+OFM_DATA = {
+    "OFM-Common": SimpleNamespace(icon_url="/img/icons/common.png", description="Basis"),
+    "OFM-Only": SimpleNamespace(description="ohne Icon"),
+    "OAM-Logic/Intern": SimpleNamespace(icon_url="/img/icons/intern.png", description="Internes Modul"),
+}
+# (name, usage count), as built by HTMLGenerator
+MODULES_SORTED = [("OFM-Common", 3), ("OFM-Logic", 2), ("OFM-Only", 1)]
+DEVICES_SORTED = [("REG1", 3), ("PiPico", 2), ("Sensor-UP", 1)]
+DEVICES_OTHER_SORTED = [("Other-A", 2), ("Other-B", 1)]
+
+
+def _dict_based_rows(oam_names, modules_sorted, devices_sorted, devices_other_sorted):
+    """
+    Rows as selected by dependencies_template.html before MembershipMatrix, by membership in the OAM data
+    """
+    def ofm_cell(name, key):
+        ofm = OFM_DATA.get(key)
+        return {
+            "name": name,
+            "icon_url": getattr(ofm, "icon_url", "") if ofm else "",
+            "description": getattr(ofm, "description", "") if ofm else "",
+        }
+
+    rows = []
+    for oam_name in oam_names:
+        oam_details = OAM_DATA[oam_name]
+        modules = oam_details["modules"]
+        devices = oam_details["devices"]
+        rows.append({
+            "name": oam_name,
+            "description": oam_details["description"],
+            "module_cells": [(module, module in modules) for module, count in modules_sorted if count > 1],
+            "single_modules": [ofm_cell(module, module) for module, count in modules_sorted
+                               if count == 1 and module in modules],
+            "internal_modules": [ofm_cell(module, f"{oam_name}/{module}") for module in oam_details["modules_internal"]],
+            "device_cells": [(device, device in devices) for device, count in devices_sorted if count > 1],
+            "single_devices": [device for device, count in devices_sorted if count == 1 and device in devices],
+            "other_devices": [device for device, _ in devices_other_sorted if device in devices],
+        })
+    return rows
+
+
+@pytest.fixture
+def matrix():
+    return MembershipMatrix(OAM_DATA, [module for module, _ in MODULES_SORTED],
+                            [device for device, _ in DEVICES_SORTED + DEVICES_OTHER_SORTED])
+
+
+def test_rows_of_full_table_match_dict_based_rows(matrix):
+    rows = HTMLGenerator._dependency_table_rows(matrix, matrix.oam_names, OAM_DATA, OFM_DATA,
+                                                MODULES_SORTED, DEVICES_SORTED, DEVICES_OTHER_SORTED)
+    assert rows == _dict_based_rows(list(OAM_DATA), MODULES_SORTED, DEVICES_SORTED, DEVICES_OTHER_SORTED)
+
+
+def test_rows_of_ofm_table_match_dict_based_rows(matrix):
+    oam_names = matrix.oams_with_module("OFM-Logic")
+    assert oam_names == [oam_name for oam_name, details in OAM_DATA.items() if "OFM-Logic" in details["modules"]]
+    rows = HTMLGenerator._dependency_table_rows(matrix, oam_names, OAM_DATA, OFM_DATA,
+                                                [], DEVICES_SORTED, DEVICES_OTHER_SORTED)
+    assert rows == _dict_based_rows(oam_names, [], DEVICES_SORTED, DEVICES_OTHER_SORTED)
+
+
+def test_rows_of_device_table_match_dict_based_rows(matrix):
+    oam_names = matrix.oams_with_device("PiPico")
+    assert oam_names == [oam_name for oam_name, details in OAM_DATA.items() if "PiPico" in details["devices"]]
+    modules_of_device = [module for module in MODULES_SORTED
+                         if any(module[0] in OAM_DATA[oam_name]["modules"] for oam_name in oam_names)]
+    rows = HTMLGenerator._dependency_table_rows(matrix, oam_names, OAM_DATA, OFM_DATA,
+                                                modules_of_device, [], [])
+    assert rows == _dict_based_rows(oam_names, modules_of_device, [], [])
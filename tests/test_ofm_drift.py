@@ -0,0 +1,69 @@
+# Tests for the Version-Drift of the OFMs Pinned by the OAMs
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+from ofm_drift import OfmDrift
+from rate_limit import RateLimitBudget
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeClient:
+    base_url = "https://api.github.com"
+    org_name = "OpenKNX"
+
+    def __init__(self, heads, calls_left=None):
+        self.heads = heads
+        self.budget = RateLimitBudget(reserve=0)
+        if calls_left is not None:
+            self.budget.update({'X-RateLimit-Remaining': str(calls_left)})
+        self.calls = []
+
+    def _call(self, call):
+        self.calls.append(call)
+        if self.budget.is_known():
+            self.budget.update({'X-RateLimit-Remaining': str(self.budget.remaining - 1)})
+
+    def get_branch_head_sha(self, name, branch):
+        self._call(("head", name))
+        return self.heads[name]
+
+    def get_response(self, url, allowed_not_found=False):
+        self._call(("compare", url.split("/compare/")[1].split("?")[0]))
+        return FakeResponse({"status": "ahead", "ahead_by": 2, "behind_by": 0})
+
+
+def _dependencies(pins):
+    """
+    :param pins: dict OAM-name -> dict OFM-name -> commit
+    """
+    return {oam: {ofm: {"commit": commit, "branch": "v1"} for ofm, commit in ofms.items()} for oam, ofms in pins.items()}
+
+
+def test_head_lookups_are_planned_within_budget(tmp_path):
+    client = FakeClient({"OFM-A": "a2", "OFM-B": "b2"}, calls_left=1)
+    drift = OfmDrift(client, cache_path=str(tmp_path / "drift.json"), max_workers=1)
+    result = drift.analyse(_dependencies({"OAM-X": {"OFM-A": "a1", "OFM-B": "b1"}}))
+    # one head read, no budget left for the comparison
+    assert client.calls == [("head", "OFM-A")]
+    assert result["OFM-A"]["head"] == "a2" and result["OFM-A"]["pins"]["OAM-X"]["status"] is None
+    assert result["OFM-B"]["head"] is None and result["OFM-B"]["pins"]["OAM-X"]["status"] == "unknown"
+
+
+def test_compares_are_cached_for_current_pairs_only(tmp_path):
+    client = FakeClient({"OFM-A": "a2"})
+    cache_path = str(tmp_path / "drift.json")
+    drift = OfmDrift(client, cache_path=cache_path)
+    result = drift.analyse(_dependencies({"OAM-X": {"OFM-A": "a1"}, "OAM-Y": {"OFM-A": "a1"}}))
+    assert result["OFM-A"]["pins"]["OAM-X"] == {"commit": "a1", "branch": "v1", "status": "behind", "behind_by": 2, "ahead_by": 0}
+    assert client.calls == [("head", "OFM-A"), ("compare", "a1...a2")]
+
+    # pin moved: old pair is removed from the cache
+    drift = OfmDrift(client, cache_path=cache_path)
+    drift.analyse(_dependencies({"OAM-X": {"OFM-A": "a0"}}))
+    assert list(drift.compares) == ["OFM-A:a0...a2"]
@@ -0,0 +1,39 @@
+# Tests for Planning Work within the Remaining API Budget
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+from rate_limit import RateLimitBudget, WorkItem
+
+
+def _budget(remaining, reserve=5):
+    budget = RateLimitBudget(reserve)
+    budget.update({'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Reset': '0'})
+    return budget
+
+
+def test_plan_unknown_budget_schedules_all_by_priority():
+    items = [WorkItem(2, 1, "b"), WorkItem(1, 1, "a"), WorkItem(3, 100, "c")]
+    scheduled, deferred = RateLimitBudget().plan(items)
+    assert [item.payload for item in scheduled] == ["a", "b", "c"]
+    assert deferred == []
+
+
+def test_plan_defers_least_important_items():
+    items = [WorkItem((1, "x"), 2, "refresh"), WorkItem((0, -2), 2, "changed-new"), WorkItem((0, -1), 2, "changed-old")]
+    scheduled, deferred = _budget(remaining=9).plan(items)  # 4 usable calls after reserve
+    assert [item.payload for item in scheduled] == ["changed-new", "changed-old"]
+    assert [item.payload for item in deferred] == ["refresh"]
+
+
+def test_plan_fills_budget_with_smaller_items():
+    items = [WorkItem(0, 3, "a"), WorkItem(1, 3, "b"), WorkItem(2, 1, "c")]
+    scheduled, deferred = _budget(remaining=9).plan(items)
+    assert [item.payload for item in scheduled] == ["a", "c"]
+    assert [item.payload for item in deferred] == ["b"]
+
+
+def test_plan_ignores_other_resources():
+    budget = RateLimitBudget()
+    budget.update({'X-RateLimit-Remaining': '0', 'X-RateLimit-Resource': 'search'})
+    assert not budget.is_known()
+    scheduled, deferred = budget.plan([WorkItem(0, 1, "a")])
+    assert len(scheduled) == 1 and deferred == []
@@ -0,0 +1,97 @@
+# Tests for the Incremental Listing of the Org Repos
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+from github_client import GitHubClient
+from model import Repo
+from repo_list import RepoList
+
+
+class FakePagesClient(GitHubClient):
+    """
+    Serves the repo listing from a fixed list of repos, page by page as the API, in both orders of the API
+    """
+
+    def __init__(self, repos):
+        super().__init__()
+        self.repos = repos
+        self.requested_pages = []
+
+    def get_json_response(self, url):
+        query = dict(parse_qsl(urlsplit(url).query))
+        page, per_page = int(query["page"]), int(query["per_page"])
+        self.requested_pages.append((page, query.get("sort")))
+        repos = self.repos
+        if query.get("sort") == "pushed":
+            repos = sorted(repos, key=lambda r: r["pushed_at"], reverse=True)
+        return [dict(repo) for repo in repos[(page - 1) * per_page:page * per_page]]
+
+
+def _repo_data(name, pushed_at, updated_at=None):
+    return {"name": name, "pushed_at": pushed_at, "updated_at": updated_at or pushed_at}
+
+
+REPOS = [
+    _repo_data("OAM-A", "2025-01-05T00:00:00Z"),
+    _repo_data("OAM-B", "2025-01-04T00:00:00Z"),
+    _repo_data("OAM-C", "2025-01-03T00:00:00Z"),
+    _repo_data("OAM-D", "2025-01-02T00:00:00Z"),
+    _repo_data("OAM-E", "2025-01-01T00:00:00Z"),
+]
+# 250 repos: 3 pages, pushed one per hour, newest first
+MANY_REPOS = [_repo_data(f"OFM-{i:03}", f"2025-01-{20 - i // 24:02}T{23 - i % 24:02}:00:00Z") for i in range(250)]
+
+
+def test_pushed_since_stops_at_first_older_page():
+    client = FakePagesClient(MANY_REPOS)
+    repos = client.get_org_repos_pushed_since(MANY_REPOS[120]["pushed_at"])
+    assert [repo["name"] for repo in repos] == [repo["name"] for repo in MANY_REPOS[:121]]
+    # second page ends with an older repo: no further page is read
+    assert client.requested_pages == [(1, "pushed"), (2, "pushed")]
+
+
+def test_pushed_since_reads_first_page_only_without_pushes():
+    client = FakePagesClient(MANY_REPOS)
+    assert client.get_org_repos_pushed_since("2999-01-01T00:00:00Z") == []
+    assert client.requested_pages == [(1, "pushed")]
+
+
+def test_pushed_since_reads_all_pages_while_pushed():
+    client = FakePagesClient(MANY_REPOS)
+    repos = client.get_org_repos_pushed_since("2024-12-31T00:00:00Z")
+    assert len(repos) == 250
+    assert client.requested_pages == [(1, "pushed"), (2, "pushed"), (3, "pushed")]
+
+
+def test_incremental_listing_merges_pushed_and_new_repos(tmp_path):
+    client = FakePagesClient(REPOS[1:])
+    repo_list = RepoList(client, str(tmp_path / "repos.json"))
+    assert [repo["name"] for repo in repo_list.get_repos()] == ["OAM-B", "OAM-C", "OAM-D", "OAM-E"]
+
+    # pushed after the last listing: updated in place, new repo appended
+    client.repos = [_repo_data("OAM-A", "2999-01-01T00:00:00Z"), _repo_data("OAM-C", "2999-01-02T00:00:00Z"),
+                    *REPOS[1:2], *REPOS[3:]]
+    client.requested_pages = []
+    repos = repo_list.get_repos()
+    assert [repo["name"] for repo in repos] == ["OAM-B", "OAM-C", "OAM-D", "OAM-E", "OAM-A"]
+    assert repos[1]["pushed_at"] == "2999-01-02T00:00:00Z"
+    assert all(sort == "pushed" for _, sort in client.requested_pages)
+
+
+def test_changed_repos_until_processed(tmp_path):
+    client = FakePagesClient(REPOS)
+    repo_list = RepoList(client, str(tmp_path / "repos.json"), full_refresh_interval=timedelta(0))
+    repos = [Repo.from_json(repo) for repo in repo_list.get_repos()]
+    assert set(repo_list.changed_repos(repos)) == {repo["name"] for repo in REPOS}
+
+    repo_list.mark_processed(repos[1:])
+    assert list(repo_list.changed_repos(repos)) == ["OAM-A"]
+    repo_list.mark_processed(repos[:1])
+    assert repo_list.changed_repos(repos) == {}
+
+    # change of metadata only (no push), seen on full refresh
+    client.repos = [dict(REPOS[0]), _repo_data("OAM-B", REPOS[1]["pushed_at"], "2025-02-01T00:00:00Z"), *REPOS[2:]]
+    repos = [Repo.from_json(repo) for repo in repo_list.get_repos()]
+    assert repo_list.changed_repos(repos) == {"OAM-B": "2025-02-01T00:00:00Z"}
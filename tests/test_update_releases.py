@@ -0,0 +1,124 @@
+# Tests for Scheduling the Repos of a Run within the API Budget
+# (C) 2025 Cornelius Köpp; For Usage in OpenKNX-Project only
+
+import pytest
+
+import update_releases
+from model import OamRecord, Repo
+from rate_limit import RateLimitBudget, RateLimitExhausted
+
+
+def _repo(name, pushed_at="2025-01-01T00:00:00Z"):
+    return Repo(name, updated_at=pushed_at, pushed_at=pushed_at)
+
+
+def _record(name):
+    return OamRecord(f"https://github.com/OpenKNX/{name}", False, name, [])
+
+
+@pytest.fixture
+def previous_run(monkeypatch):
+    """
+    Data of the previous run: releases of OAM-Old and OAM-Other, dependencies of OAM-Old
+    """
+    releases = {"OAM-Old": _record("OAM-Old"), "OAM-Other": _record("OAM-Other")}
+    dependencies = {"OAM-Old": {"OFM-Common": {"commit": "c1", "branch": "v1"}}}
+    monkeypatch.setattr(update_releases, "read_releases_json", lambda: releases)
+    monkeypatch.setattr(update_releases, "_load_refresh_state",
+                        lambda: {"OAM-Old": "2025-01-02T00:00:00Z", "OAM-Other": "2025-01-01T00:00:00Z"})
+    monkeypatch.setattr(update_releases.dependency_manager, "load_all_dependencies", lambda: dependencies)
+    return releases, dependencies
+
+
+def _set_budget(monkeypatch, calls):
+    budget = RateLimitBudget(reserve=0)
+    if calls is not None:
+        budget.update({'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': str(calls), 'X-RateLimit-Reset': '0'})
+    monkeypatch.setattr(update_releases.client, "budget", budget)
+
+
+def test_schedule_repos_orders_changed_and_new_repos_first(monkeypatch, previous_run):
+    _set_budget(monkeypatch, None)
+    repos = [_repo("OAM-Old"), _repo("OAM-Other"), _repo("OAM-Changed", "2025-03-01T00:00:00Z"),
+             _repo("OAM-New", "2025-02-01T00:00:00Z")]
+    scheduled, reused, kept = update_releases.schedule_repos(repos, {"OAM-Changed"})
+    # changed/new by newest push, then refreshes with the oldest refresh first
+    assert [repo.name for repo in scheduled] == ["OAM-Changed", "OAM-New", "OAM-Other", "OAM-Old"]
+    assert reused == {} and kept == set()
+
+
+def test_schedule_repos_defers_refresh_with_previous_data(monkeypatch, previous_run):
+    releases, dependencies = previous_run
+    _set_budget(monkeypatch, 2 * update_releases.API_CALLS_PER_REPO)
+    repos = [_repo("OAM-Old"), _repo("OAM-Other"), _repo("OAM-Changed")]
+    scheduled, reused, kept = update_releases.schedule_repos(repos, {"OAM-Changed"})
+    assert [repo.name for repo in scheduled] == ["OAM-Changed", "OAM-Other"]
+    assert reused == {"OAM-Old": (releases["OAM-Old"], dependencies["OAM-Old"])}
+    assert kept == set()
+
+
+def test_schedule_repos_keeps_deferred_repo_without_previous_data(monkeypatch, previous_run):
+    _set_budget(monkeypatch, 1 * update_releases.API_CALLS_PER_REPO)
+    repos = [_repo("OAM-Other"), _repo("OAM-New", "2025-02-01T00:00:00Z"), _repo("OAM-Newer", "2025-03-01T00:00:00Z")]
+    scheduled, reused, kept = update_releases.schedule_repos(repos, set())
+    assert [repo.name for repo in scheduled] == ["OAM-Newer"]
+    # deferred, not dropped: with data of the previous run, or published pages kept as they are
+    assert set(reused) == {"OAM-Other"}
+    assert kept == {"OAM-New"}
+
+
+def test_fetch_scheduled_releases_defers_rest_on_exhausted_rate_limit(monkeypatch, previous_run):
+    releases, _ = previous_run
+
+    def fetch_repo_releases(repo):
+        if repo.name == "OAM-Old":
+            raise RateLimitExhausted("Rate limit exceeded")
+        return _record(repo.name)
+
+    monkeypatch.setattr(update_releases.release_manager, "fetch_repo_releases", fetch_repo_releases)
+    reused = {}
+    kept = set()
+    fetched = update_releases.fetch_scheduled_releases([_repo("OAM-New"), _repo("OAM-Old"), _repo("OAM-Unknown")],
+                                                       reused, kept)
+    assert list(fetched) == ["OAM-New"]
+    assert set(reused) == {"OAM-Old"} and reused["OAM-Old"][0] is releases["OAM-Old"]
+    assert kept == {"OAM-Unknown"}
+
+
+def test_process_releases_history_limits_downloads_newest_first(monkeypatch, tmp_path):
+    from app_sizing_history import AppSizingHistory
+    from model import Asset, Release
+
+    def oam_record(name, tag_names):
+        releases = [Release(False, tag_name, published_at=f"2025-01-0{len(tag_names) - i}T00:00:00Z",
+                            assets=[Asset(f"{name}-{tag_name}.zip", digest=f"sha256:{name}-{tag_name}")])
+                    for i, tag_name in enumerate(tag_names)]
+        return OamRecord(f"https://github.com/OpenKNX/{name}", False, name, releases)
+
+    cached = {"OAM-A-v2"}
+    downloaded = []
+
+    def process_release_asset(oam, asset, require_app_stat=False):
+        key = asset.name[:-len(".zip")]
+        if key not in cached:
+            downloaded.append(key)
+            cached.add(key)
+        return None, {"parameter_memory_size": 1}, None
+
+    def get_asset_cache_path(oam, asset):
+        # existing file for cached results, missing file otherwise
+        return __file__ if asset.name[:-len(".zip")] in cached else str(tmp_path / asset.name)
+
+    monkeypatch.setattr(update_releases, "process_release_asset", process_release_asset)
+    monkeypatch.setattr(update_releases, "_get_asset_cache_path", get_asset_cache_path)
+    # releases newest first, as listed by GitHub
+    releases_data = {"OAM-A": oam_record("OAM-A", ["v3", "v2", "v1"]), "OAM-B": oam_record("OAM-B", ["v2", "v1"])}
+    history = AppSizingHistory(str(tmp_path / "app_sizing_history.json"))
+
+    assert update_releases.process_releases_history(releases_data, history, max_downloads=2) == 3
+    # latest release of each OAM first, cached archives do not count
+    assert downloaded == ["OAM-A-v3", "OAM-B-v2"]
+    assert history.contains("OAM-A", "v2") and not history.contains("OAM-B", "v1")
+
+    assert update_releases.process_releases_history(releases_data, history, max_downloads=2) == 2
+    assert downloaded[2:] == ["OAM-B-v1", "OAM-A-v1"]